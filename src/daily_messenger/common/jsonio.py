@@ -0,0 +1,68 @@
+"""JSON encode/decode helpers that use orjson when it is installed.
+
+orjson is an optional accelerator: the stdlib ``json`` module stays the
+fallback, and both paths produce UTF-8 output with two-space indentation.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document from bytes or text."""
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity literals that stdlib json writes by
+            # default; let the stdlib parser decide whether the input is valid.
+            pass
+    return json.loads(data)
+
+
+def load_file(path: Path) -> Any:
+    """Decode the JSON file at *path*.
+
+    With orjson the file is memory-mapped and parsed in place, skipping the
+    intermediate bytes copy for large raw artefacts.
+    """
+
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    with path.open("rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files cannot be mapped; some platforms refuse other cases.
+            return loads(f.read())
+        with mapped, memoryview(mapped) as view:
+            try:
+                return orjson.loads(view)
+            except orjson.JSONDecodeError:
+                return json.loads(bytes(view))
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, e.g. for HTTP request bodies."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Encode ``obj`` as indented UTF-8 JSON without ASCII escaping."""
+
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
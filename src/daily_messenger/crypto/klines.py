@@ -8,11 +8,18 @@ import time
 import zipfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 import pandas as pd
 import requests
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional on Python 3.13+
+    pa = None
+    pq = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_DIR = PROJECT_ROOT / "out" / "btc"
 
@@ -23,6 +30,10 @@ BINANCE = "https://data-api.binance.vision/api/v3/klines"
 KRAKEN = "https://api.kraken.com/0/public/OHLC"  # pair=XBTUSD, interval=1/5/15/60/240/1440
 BITSTAMP = "https://www.bitstamp.net/api/v2/ohlc/btcusd/"  # step=60/300/900/3600/86400, limit
 
+# Binance, Kraken and Bitstamp pages are fetched back to back; one keep-alive
+# pool avoids a fresh TCP/TLS handshake for every request.
+_SESSION: Optional[requests.Session] = None
+
 INTERVALS = {"1m", "1h", "1d"}
 INTERVAL_MAP = {
     "1m": {"binance": "1m", "kraken": 1, "bitstamp": 60},
@@ -31,6 +42,13 @@ INTERVAL_MAP = {
 }
 
 
+def _get_session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
+
+
 def parse_lookback(spec: str) -> timedelta:
     """Convert lookback strings like ``7d`` or ``12h`` to ``timedelta``."""
 
@@ -52,52 +70,101 @@ def daterange(start: datetime, end: datetime):
         cur += timedelta(days=1)
 
 
-def _load_existing(outdir: Path, interval: str) -> pd.DataFrame:
-    p = outdir / f"klines_{interval}.parquet"
-    if p.exists():
-        try:
-            return pd.read_parquet(p)
-        except ImportError as exc:
-            raise SystemExit(
-                "读取 Parquet 需要安装可选依赖 pyarrow 或 fastparquet，请先安装后重试。"
-            ) from exc
-    return pd.DataFrame(
-        columns=[
-            "open_time",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "close_time",
-            "quote_asset_volume",
-            "number_of_trades",
-            "taker_buy_base",
-            "taker_buy_quote",
-            "symbol",
-            "interval",
-        ]
-    )
-
-
-def _write_parquet(df: pd.DataFrame, outpath: Path) -> None:
-    try:
-        df.to_parquet(outpath, index=False)
-    except ImportError as exc:
-        raise SystemExit(
-            "写入 Parquet 需要安装可选依赖 pyarrow 或 fastparquet，请先安装后重试。"
-        ) from exc
+def _latest_open_time(outpath: Path) -> Optional[datetime]:
+    """Return the newest stored ``open_time``, preferring row-group statistics."""
+
+    if not outpath.exists():
+        return None
+    if pq is None:
+        raise SystemExit("读取 Parquet 需要安装可选依赖 pyarrow，请先安装后重试。")
+
+    pf = pq.ParquetFile(outpath)
+    col_idx = pf.schema_arrow.get_field_index("open_time")
+    latest = None
+    if col_idx >= 0 and pf.metadata.num_row_groups:
+        for i in range(pf.metadata.num_row_groups):
+            stats = pf.metadata.row_group(i).column(col_idx).statistics
+            if stats is None or not stats.has_min_max:
+                latest = None
+                break
+            if latest is None or stats.max > latest:
+                latest = stats.max
+    if latest is None:
+        # Files written without statistics fall back to a single-column scan.
+        times = pq.read_table(outpath, columns=["open_time"]).to_pandas()["open_time"]
+        if times.empty:
+            return None
+        latest = times.max()
+
+    ts = pd.Timestamp(latest)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(timezone.utc)
+    return ts.to_pydatetime()
+
+
+NUMERIC_COLUMNS = [
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "quote_asset_volume",
+    "taker_buy_base",
+    "taker_buy_quote",
+]
+
+
+def _coerce_numeric(df: pd.DataFrame, columns: Sequence[str]) -> None:
+    """Parse the price/volume block (strings in upstream payloads) in one pass."""
+
+    columns = list(columns)
+    values = pd.to_numeric(df[columns].to_numpy(dtype=object).ravel(), errors="coerce")
+    df[columns] = values.reshape(len(df), len(columns))
+
+
+def _ordered_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Return ``chunk`` in strictly increasing ``open_time`` order.
+
+    Upstream pages are already ordered, so the sort only runs on the small
+    chunk when a source misbehaves, never on the merged history.
+    """
+
+    times = chunk["open_time"]
+    if times.is_monotonic_increasing and times.is_unique:
+        return chunk
+    return chunk.drop_duplicates(subset=["open_time"]).sort_values("open_time")
+
+
+def _write_frames(frames: Sequence[pd.DataFrame], outpath: Path, *, append: bool = False) -> int:
+    """Write ordered kline frames as one Arrow table and return the stored row count.
+
+    Frames are converted once and concatenated at the Arrow level, avoiding a
+    pandas concat over the whole history. With ``append`` the stored table is
+    read back as Arrow and the new frames follow it. Providers differ slightly
+    in schema (missing ``interval``, null-only columns), so types are promoted.
+    """
+
+    if pq is None:
+        raise SystemExit("写入 Parquet 需要安装可选依赖 pyarrow，请先安装后重试。")
+    tables = [pa.Table.from_pandas(frame, preserve_index=False) for frame in frames]
+    if append and outpath.exists():
+        tables.insert(0, pq.read_table(outpath))
+    table = pa.concat_tables(tables, promote_options="permissive")
+    pq.write_table(table, outpath)
+    return table.num_rows
 
 
 def fetch_one(symbol: str, interval: str, date_str: str) -> pd.DataFrame:
     url = BASE + DAILY_PATH.format(symbol=symbol, interval=interval, date=date_str)
-    r = requests.get(url, timeout=30)
+    r = _get_session().get(url, timeout=30)
     if r.status_code != 200:
         return pd.DataFrame()
     with zipfile.ZipFile(io.BytesIO(r.content)) as zf:
         # Each archive contains a single CSV such as BTCUSDT-1m-2024-01-01.csv.
         name = [n for n in zf.namelist() if n.endswith(".csv")][0]
-        with zf.open(name) as f:
+        # Decompress the member in one read; ZipExtFile is slow under the CSV
+        # parser's many small reads, and daily archives are only a few MB.
+        with io.BytesIO(zf.read(name)) as f:
             df = pd.read_csv(
                 f,
                 header=None,
@@ -118,18 +185,7 @@ def fetch_one(symbol: str, interval: str, date_str: str) -> pd.DataFrame:
             )
             df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
             df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-            numeric_cols = [
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "quote_asset_volume",
-                "taker_buy_base",
-                "taker_buy_quote",
-            ]
-            for c in numeric_cols:
-                df[c] = pd.to_numeric(df[c], errors="coerce")
+            _coerce_numeric(df, NUMERIC_COLUMNS)
             df["symbol"] = symbol
             df["interval"] = interval
             return df
@@ -137,7 +193,7 @@ def fetch_one(symbol: str, interval: str, date_str: str) -> pd.DataFrame:
 
 def fetch_binance(symbol: str, interval: str, start_ms: int, end_ms: int, limit=1000) -> pd.DataFrame:
     params = {"symbol": symbol, "interval": interval, "startTime": start_ms, "endTime": end_ms, "limit": limit}
-    r = requests.get(BINANCE, params=params, timeout=15)
+    r = _get_session().get(BINANCE, params=params, timeout=15)
     r.raise_for_status()
     rows = r.json()
     cols = [
@@ -159,24 +215,14 @@ def fetch_binance(symbol: str, interval: str, start_ms: int, end_ms: int, limit=
         return df
     df["open_time"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
     df["close_time"] = pd.to_datetime(df["close_time"], unit="ms", utc=True)
-    for c in [
-        "open",
-        "high",
-        "low",
-        "close",
-        "volume",
-        "quote_asset_volume",
-        "taker_buy_base",
-        "taker_buy_quote",
-    ]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    _coerce_numeric(df, NUMERIC_COLUMNS)
     df["symbol"] = symbol
     return df.drop(columns=["ignore"]).assign(interval=interval)
 
 
 def fetch_kraken(interval_min: int, since_unix: int) -> pd.DataFrame:
     params = {"pair": "XBTUSD", "interval": interval_min, "since": since_unix}
-    r = requests.get(KRAKEN, params=params, timeout=15)
+    r = _get_session().get(KRAKEN, params=params, timeout=15)
     r.raise_for_status()
     data = r.json()["result"]
     pair_key = [k for k in data.keys() if k != "last"][0]
@@ -210,14 +256,13 @@ def fetch_kraken(interval_min: int, since_unix: int) -> pd.DataFrame:
             "symbol",
         ]
     ]
-    for c in ["open", "high", "low", "close", "volume"]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+    _coerce_numeric(df, ["open", "high", "low", "close", "volume"])
     return df
 
 
 def fetch_bitstamp(step: int, start_unix: int, end_unix: int) -> pd.DataFrame:
     params = {"step": step, "limit": 1000, "start": start_unix, "end": end_unix}
-    r = requests.get(BITSTAMP, params=params, timeout=15)
+    r = _get_session().get(BITSTAMP, params=params, timeout=15)
     r.raise_for_status()
     # {'data': {'ohlc': [{'timestamp': '1711920000', 'open': '...', ...}]}}
     ohlc = r.json().get("data", {}).get("ohlc", [])
@@ -271,6 +316,7 @@ def init_history(
     outpath = outdir / f"klines_{interval}.parquet"
 
     frames = []
+    last_open_time = None
     for d in daterange(start, end):
         date_str = d.strftime("%Y-%m-%d")
         try:
@@ -278,8 +324,13 @@ def init_history(
         except Exception as exc:  # noqa: BLE001
             print(f"WARN {date_str}: {exc}")
             df = pd.DataFrame()
+        if not df.empty:
+            df = _ordered_chunk(df)
+            if last_open_time is not None:
+                df = df[df["open_time"] > last_open_time]
         if not df.empty:
             frames.append(df)
+            last_open_time = df["open_time"].iloc[-1]
             print(f"OK  {date_str}: {len(df)} rows")
         else:
             print(f"MISS {date_str}")
@@ -288,13 +339,10 @@ def init_history(
         print("No data fetched. Check connectivity or use incremental REST script.")
         return outpath
 
-    all_df = (
-        pd.concat(frames, ignore_index=True)
-        .drop_duplicates(subset=["open_time"])
-        .sort_values("open_time")
-    )
-    _write_parquet(all_df, outpath)
-    print(f"Saved {len(all_df)} rows -> {outpath}")
+    # Each day is trimmed against the previous one, so the frames are already
+    # ordered and duplicate-free.
+    total = _write_frames(frames, outpath)
+    print(f"Saved {total} rows -> {outpath}")
     return outpath
 
 
@@ -311,14 +359,13 @@ def incremental_fetch(
     outdir.mkdir(parents=True, exist_ok=True)
     outpath = outdir / f"klines_{interval}.parquet"
 
-    df = _load_existing(outdir, interval)
-    if df.empty:
+    # The resume point comes from parquet metadata; the full history is
+    # loaded later, and only when there is something to merge.
+    latest = _latest_open_time(outpath)
+    if latest is None:
         start = datetime.now(timezone.utc) - parse_lookback(lookback)
     else:
-        start = (
-            pd.to_datetime(df["open_time"].max()).to_pydatetime().replace(tzinfo=timezone.utc)
-            - parse_lookback(lookback)
-        )
+        start = latest - parse_lookback(lookback)
     end = datetime.now(timezone.utc)
 
     b_int = INTERVAL_MAP[interval]["binance"]
@@ -326,6 +373,7 @@ def incremental_fetch(
     s_int = INTERVAL_MAP[interval]["bitstamp"]
 
     cur = start
+    last_open_time = latest
     frames: List[pd.DataFrame] = []
     pages = 0
     while cur < end and pages < max_pages:
@@ -361,21 +409,25 @@ def incremental_fetch(
                     chunk = pd.DataFrame()
 
         if chunk is not None and not chunk.empty:
-            frames.append(chunk)
-            last_ts = pd.to_datetime(chunk["open_time"].max()).to_pydatetime().replace(tzinfo=timezone.utc)
+            chunk = _ordered_chunk(chunk)
+            # Chunks are ordered and open_time is already a UTC Timestamp.
+            last_ts = chunk["open_time"].iloc[-1].to_pydatetime()
+            # Bars re-fetched by the lookback overlap are already stored; keep only
+            # the ones past the boundary so the file stays ordered by append.
+            fresh = chunk if last_open_time is None else chunk[chunk["open_time"] > last_open_time]
+            if not fresh.empty:
+                frames.append(fresh)
+                last_open_time = fresh["open_time"].iloc[-1]
             cur = last_ts + timedelta(milliseconds=1)
-            print(f"{source}: +{len(chunk)} rows -> advance to {last_ts}")
+            print(f"{source}: +{len(fresh)} rows -> advance to {last_ts}")
         else:
             cur = cur + delta
             print("empty window, advance")
         time.sleep(0.2)  # Be polite to upstream APIs.
 
     if frames:
-        add = pd.concat(frames, ignore_index=True)
-        all_df = pd.concat([df, add], ignore_index=True)
-        all_df = all_df.drop_duplicates(subset=["open_time"]).sort_values("open_time")
-        _write_parquet(all_df, outpath)
-        print(f"Saved {len(all_df)} rows -> {outpath}")
+        total = _write_frames(frames, outpath, append=True)
+        print(f"Saved {total} rows -> {outpath}")
     else:
         print("No new data fetched.")
     return outpath
@@ -3,85 +3,226 @@
 from __future__ import annotations
 
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 import numpy as np
 import pandas as pd
 import yaml
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional on Python 3.13+
+    pq = None
+
+# libyaml's C loader is much faster when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DEFAULT_DATA_DIR = PROJECT_ROOT / "out" / "btc"
 DEFAULT_REPORT = PROJECT_ROOT / "out" / "btc_report.md"
 DEFAULT_CONFIG = PROJECT_ROOT / "config" / "ta_btc.yml"
 
+# The report only ever touches OHLC prices, so skip the remaining kline columns.
+REPORT_COLUMNS = ("open_time", "open", "high", "low", "close")
+
+INDICATOR_CACHE = "klines_1d_indicators.parquet"
+INDICATOR_COLUMNS = ("SMA50", "SMA200", "RSI14", "ATR14")
+# Longest daily lookback (SMA200): replayed ahead of any recomputed suffix, and
+# the number of newest bars a cold start fills in.
+INDICATOR_WARMUP = 200
+
+# Intraday snapshots only look at the newest bars: 24 hourly closes, and enough
+# minute bars for RSI14's Wilder smoothing to converge.
+H1_SNAPSHOT_ROWS = 24
+M1_SNAPSHOT_ROWS = 500
+
 
 def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
-    rs = avg_gain / (avg_loss.replace(0, np.nan))
-    return 100 - (100 / (1 + rs))
+    close = series.to_numpy(dtype=np.float64)
+    delta = np.diff(close, prepend=np.nan)
+    # Smooth gains and losses together so Wilder's recursion walks the data once.
+    moves = np.column_stack([np.clip(delta, 0, None), np.clip(-delta, 0, None)])
+    smoothed = (
+        pd.DataFrame(moves)
+        .ewm(alpha=1 / period, min_periods=period, adjust=False)
+        .mean()
+        .to_numpy()
+    )
+    avg_gain = smoothed[:, 0]
+    avg_loss = np.where(smoothed[:, 1] == 0, np.nan, smoothed[:, 1])
+    return pd.Series(100 - (100 / (1 + avg_gain / avg_loss)), index=series.index)
 
 
 def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
-    prev_close = close.shift(1)
-    tr = pd.concat(
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax skips the NaN previous close on the first bar, like DataFrame.max(axis=1).
+    tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+    return pd.Series(tr, index=df.index).rolling(window=period, min_periods=1).mean()
+
+
+def pivots(h, l, c) -> np.ndarray:
+    """Return classic pivot levels stacked as ``(pp, r1, s1, r2, s2, r3, s3)``.
+
+    Accepts scalars or equally shaped arrays; the result has a leading axis of 7 so
+    both a single bar and a whole window can be unpacked the same way.
+    """
+
+    high = np.asarray(h, dtype=np.float64)
+    low = np.asarray(l, dtype=np.float64)
+    close = np.asarray(c, dtype=np.float64)
+    pp = (high + low + close) / 3.0
+    rng = high - low
+    return np.stack(
         [
-            (high - low).abs(),
-            (high - prev_close).abs(),
-            (low - prev_close).abs(),
-        ],
-        axis=1,
-    ).max(axis=1)
-    return tr.rolling(window=period, min_periods=1).mean()
-
-
-def pivots(h, l, c):
-    pp = (h + l + c) / 3
-    r1 = 2 * pp - l
-    s1 = 2 * pp - h
-    r2 = pp + (h - l)
-    s2 = pp - (h - l)
-    r3 = h + 2 * (pp - l)
-    s3 = l - 2 * (h - pp)
-    return pp, r1, s1, r2, s2, r3, s3
-
-
-def _load_parquet(datadir: Path, interval: str) -> pd.DataFrame:
+            pp,
+            2 * pp - low,
+            2 * pp - high,
+            pp + rng,
+            pp - rng,
+            high + 2 * (pp - low),
+            low - 2 * (high - pp),
+        ]
+    )
+
+
+def _load_parquet(
+    datadir: Path,
+    interval: str,
+    columns: Optional[Sequence[str]] = REPORT_COLUMNS,
+) -> pd.DataFrame:
+    """Load ``klines_<interval>.parquet``; pass ``columns=None`` for every column."""
+
     p = datadir / f"klines_{interval}.parquet"
     if not p.exists():
         return pd.DataFrame()
-    try:
-        df = pd.read_parquet(p)
-    except ImportError as exc:
-        raise SystemExit(
-            "读取 Parquet 需要安装可选依赖 pyarrow 或 fastparquet，请先安装后重试。"
-        ) from exc
+    if pq is None:
+        raise SystemExit("读取 Parquet 需要安装可选依赖 pyarrow，请先安装后重试。")
+    df = pq.read_table(p, columns=list(columns) if columns else None).to_pandas()
     df = df.sort_values("open_time").set_index("open_time")
     return df
 
 
+def _load_parquet_tail(
+    datadir: Path,
+    interval: str,
+    rows: int,
+    columns: Sequence[str] = ("open_time", "close"),
+) -> pd.DataFrame:
+    """Load the newest ``rows`` bars by decoding only the trailing row groups."""
+
+    p = datadir / f"klines_{interval}.parquet"
+    if not p.exists():
+        return pd.DataFrame()
+    if pq is None:
+        raise SystemExit("读取 Parquet 需要安装可选依赖 pyarrow，请先安装后重试。")
+    pf = pq.ParquetFile(p)
+    groups = []
+    remaining = rows
+    # Files are written in open_time order, so the newest bars sit in the last groups.
+    for i in reversed(range(pf.num_row_groups)):
+        if remaining <= 0:
+            break
+        groups.insert(0, i)
+        remaining -= pf.metadata.row_group(i).num_rows
+    if not groups:
+        return pd.DataFrame()
+    df = pf.read_row_groups(groups, columns=list(columns)).to_pandas()
+    return df.sort_values("open_time").set_index("open_time").tail(rows)
+
+
+def _compute_daily_indicators(frame: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "SMA50": frame["close"].rolling(50, min_periods=1).mean(),
+            "SMA200": frame["close"].rolling(200, min_periods=1).mean(),
+            "RSI14": rsi(frame["close"], 14),
+            "ATR14": atr(frame, 14),
+        },
+        index=frame.index,
+    )
+
+
+def _daily_indicators(d1: pd.DataFrame, datadir: Path) -> pd.DataFrame:
+    """Return daily indicators for the newest bars, reusing cached closed days.
+
+    Only the trailing ``INDICATOR_WARMUP`` bars (or the suffix after the cache)
+    get values, each computed over a bounded warmup slice, so the cost does not
+    grow with the length of the history. Closed days persist in ``INDICATOR_CACHE``;
+    the newest bar may still be forming and is always recomputed, never cached.
+    A cache that no longer lines up with ``d1`` is discarded and rebuilt.
+    """
+
+    cache_path = datadir / INDICATOR_CACHE
+    start = max(0, len(d1) - INDICATOR_WARMUP)
+    cached = pd.DataFrame()
+    if pq is not None and cache_path.exists():
+        cached = pq.read_table(cache_path).to_pandas().set_index("open_time")
+        first = int(d1.index.searchsorted(cached.index[0])) if len(cached) else 0
+        resume = first + len(cached)
+        window = d1.iloc[first:resume]
+        if (
+            start <= resume < len(d1)
+            and window.index.equals(cached.index)
+            and np.array_equal(window["close"].to_numpy(), cached["close"].to_numpy())
+        ):
+            start = resume
+        else:
+            cached = pd.DataFrame()
+
+    offset = max(0, start - INDICATOR_WARMUP)
+    fresh = _compute_daily_indicators(d1.iloc[offset:]).iloc[start - offset :]
+    if cached.empty:
+        indicators = fresh
+    else:
+        indicators = pd.concat([cached[list(INDICATOR_COLUMNS)], fresh])
+
+    closed = indicators.iloc[:-1]
+    if pq is not None and len(closed) > len(cached):
+        payload = closed.assign(close=d1["close"].loc[closed.index])
+        payload.rename_axis("open_time").reset_index().to_parquet(cache_path, index=False)
+    return indicators
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path_str: str, mtime_ns: int) -> dict:
+    with open(path_str, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
 def _load_config(path: Path) -> dict:
-    if not path.exists():
+    """Parse ``path`` once per modification time; treat the result as read-only."""
+
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return _load_config_cached(str(path), mtime_ns)
+
+
+_FMT_SPECS = {nd: f"{{:.{nd}f}}".format for nd in range(6)}
+_INF = float("inf")
 
 
 def _fmt(value, *, nd: int = 2, na_text: str = "—") -> str:
-    try:
-        val = float(value)
-    except (TypeError, ValueError):
-        return na_text
-    if not np.isfinite(val):
+    # Plain floats (numpy float64 included) skip the generic conversion path.
+    if type(value) is float or isinstance(value, np.float64):
+        val = value
+    else:
+        try:
+            val = float(value)
+        except (TypeError, ValueError):
+            return na_text
+    if val != val or val == _INF or val == -_INF:
         return na_text
-    return f"{val:.{nd}f}"
+    spec = _FMT_SPECS.get(nd)
+    return spec(val) if spec is not None else f"{val:.{nd}f}"
 
 
 def build_report(
@@ -91,8 +232,6 @@ def build_report(
     config_path: Optional[Path] = DEFAULT_CONFIG,
 ) -> Path:
     d1 = _load_parquet(datadir, "1d")
-    h1 = _load_parquet(datadir, "1h")
-    m1 = _load_parquet(datadir, "1m")
 
     if d1.empty:
         raise SystemExit("缺少日线数据，先跑 btc fetch --interval 1d")
@@ -108,10 +247,7 @@ def build_report(
         intraday_granularities = {str(gran).upper() for gran in intraday_grans_raw}
 
     # Compute technical indicators used in the report.
-    d1["SMA50"] = d1["close"].rolling(50, min_periods=1).mean()
-    d1["SMA200"] = d1["close"].rolling(200, min_periods=1).mean()
-    d1["RSI14"] = rsi(d1["close"], 14)
-    d1["ATR14"] = atr(d1, 14)
+    d1 = d1.join(_daily_indicators(d1, datadir))
     last = d1.iloc[-1]
 
     lines = []
@@ -127,21 +263,27 @@ def build_report(
     lines.append("\n## 枢轴位 (基于昨日)\n")
     if len(d1) >= 2:
         prev = d1.iloc[-2]
-        pp, r1, s1, r2, s2, r3, s3 = pivots(prev["high"], prev["low"], prev["close"])
+        pp, r1, s1, r2, s2, r3, s3 = pivots(*prev[["high", "low", "close"]].to_numpy())
         lines.append(
             f"PP: {_fmt(pp)} | R1: {_fmt(r1)} | S1: {_fmt(s1)} | R2: {_fmt(r2)} | S2: {_fmt(s2)} | R3: {_fmt(r3)} | S3: {_fmt(s3)}\n"
         )
     else:
         lines.append("历史不足，暂无法计算枢轴位。\n")
 
-    if include_intraday and "H1" in intraday_granularities and not h1.empty:
+    h1 = pd.DataFrame()
+    if include_intraday and "H1" in intraday_granularities:
+        h1 = _load_parquet_tail(datadir, "1h", H1_SNAPSHOT_ROWS)
+    if not h1.empty:
         h_last = h1.iloc[-1]
         lines.append("\n## 小时级快照\n")
         lines.append(
             f"1h 收盘: {_fmt(h_last['close'])}; 近 24 根均价: {_fmt(h1['close'].tail(24).mean())}\n"
         )
 
-    if include_intraday and {"M1", "1M"}.intersection(intraday_granularities) and not m1.empty:
+    m1 = pd.DataFrame()
+    if include_intraday and {"M1", "1M"}.intersection(intraday_granularities):
+        m1 = _load_parquet_tail(datadir, "1m", M1_SNAPSHOT_ROWS)
+    if not m1.empty:
         m_last = m1.iloc[-1]
         m1["RSI14"] = rsi(m1["close"], 14)
         lines.append("\n## 分钟级快照\n")
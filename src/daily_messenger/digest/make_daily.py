@@ -4,15 +4,21 @@
 from __future__ import annotations
 
 import argparse
-import json
+import heapq
 import logging
 import os
+import shutil
+import tempfile
 from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Mapping
+from operator import itemgetter
+from typing import Any, Dict, List, Mapping, Tuple
 
-from daily_messenger.common import run_meta
+import numpy as np
+
+from daily_messenger.common import jsonio, run_meta
 from daily_messenger.common.logging import log, setup_logger
 from daily_messenger.etl.run_fetch import (
     AI_NEWS_MARKET_SPECS,
@@ -24,7 +30,7 @@ from jinja2 import (
     Environment,
     FileSystemLoader,
     PackageLoader,
-    select_autoescape,
+    Template,
 )
 
 PACKAGE_ROOT = Path(__file__).resolve().parent
@@ -42,6 +48,7 @@ SENTIMENT_LABELS = {
     "put_call": "Cboe 认沽/认购",
     "aaii": "AAII 多空差",
 }
+RAW_LINKS = {"market": "raw_market.json", "events": "raw_events.json"}
 MARKET_LABELS = {spec.market: spec.label for spec in AI_NEWS_MARKET_SPECS}
 MARKET_ORDER = [spec.market for spec in AI_NEWS_MARKET_SPECS]
 NEWS_FALLBACK = "今日暂无五市市场资讯"
@@ -58,37 +65,8 @@ class ThemePayload:
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "ThemePayload":
-        try:
-            name = str(data["name"])
-        except KeyError as exc:  # noqa: B904
-            raise ValueError("主题缺少 name 字段") from exc
-        label = str(data.get("label", name))
-        total = float(data.get("total", 0.0))
-        breakdown_raw = data.get("breakdown", {})
-        breakdown: Dict[str, float] = {}
-        if isinstance(breakdown_raw, Mapping):
-            for key, value in breakdown_raw.items():
-                try:
-                    breakdown[str(key)] = float(value)
-                except (TypeError, ValueError):
-                    continue
-        detail_raw = data.get("breakdown_detail", {})
-        if isinstance(detail_raw, Mapping):
-            detail = {
-                str(k): dict(v) for k, v in detail_raw.items() if isinstance(v, Mapping)
-            }
-        else:
-            detail = {}
-        meta_raw = data.get("meta")
-        meta = dict(meta_raw) if isinstance(meta_raw, Mapping) else {}
-        return cls(
-            name=name,
-            label=label,
-            total=total,
-            breakdown=breakdown,
-            breakdown_detail=detail,
-            meta=meta,
-        )
+        # Public entry point: accept any mapping, validate it as a plain dict.
+        return cls(**_validate_theme(dict(data)))
 
     def to_mapping(self) -> Dict[str, object]:
         return {
@@ -109,18 +87,73 @@ class ActionPayload:
 
     @classmethod
     def from_mapping(cls, data: Mapping[str, Any]) -> "ActionPayload":
-        try:
-            action = str(data["action"])
-            name = str(data["name"])
-        except KeyError as exc:  # noqa: B904
-            raise ValueError("操作项缺少 action/name 字段") from exc
-        reason = str(data.get("reason", ""))
-        return cls(action=action, name=name, reason=reason)
+        return cls(**_validate_action(dict(data)))
 
     def to_mapping(self) -> Dict[str, str]:
         return {"action": self.action, "name": self.name, "reason": self.reason}
 
 
+def _as_str(value: object) -> str:
+    """Return *value* as text, skipping ``str()`` for json-decoded strings."""
+
+    return value if type(value) is str else str(value)
+
+
+# ``dict`` first: isinstance() tries the exact type before the Mapping ABC.
+_MAPPING_TYPES = (dict, Mapping)
+
+
+def _validate_theme(data: Dict[str, Any]) -> Dict[str, object]:
+    """Validate a raw theme straight into the mapping used by the templates.
+
+    Nested nodes may be any ``Mapping``; listing ``dict`` first in the type
+    check keeps json-decoded input off the slower ABC path. Nested mappings
+    are copied so later changes to the caller's data never reach the payload.
+    """
+
+    try:
+        name = _as_str(data["name"])
+    except KeyError as exc:  # noqa: B904
+        raise ValueError("主题缺少 name 字段") from exc
+    label = _as_str(data.get("label", name))
+    total = float(data.get("total", 0.0))
+    breakdown_raw = data.get("breakdown", {})
+    breakdown: Dict[str, float] = {}
+    if isinstance(breakdown_raw, _MAPPING_TYPES):
+        _str, _float = _as_str, float
+        for key, value in breakdown_raw.items():
+            try:
+                breakdown[_str(key)] = _float(value)
+            except (TypeError, ValueError):
+                continue
+    detail_raw = data.get("breakdown_detail", {})
+    detail: Dict[str, Dict[str, object]] = {}
+    if isinstance(detail_raw, _MAPPING_TYPES):
+        _str, _isinstance = _as_str, isinstance
+        for k, v in detail_raw.items():
+            if _isinstance(v, _MAPPING_TYPES):
+                detail[_str(k)] = dict(v)
+    meta_raw = data.get("meta")
+    meta = dict(meta_raw) if isinstance(meta_raw, _MAPPING_TYPES) else {}
+    return {
+        "name": name,
+        "label": label,
+        "total": total,
+        "breakdown": breakdown,
+        "breakdown_detail": detail,
+        "meta": meta,
+    }
+
+
+def _validate_action(data: Dict[str, Any]) -> Dict[str, str]:
+    try:
+        action = _as_str(data["action"])
+        name = _as_str(data["name"])
+    except KeyError as exc:  # noqa: B904
+        raise ValueError("操作项缺少 action/name 字段") from exc
+    return {"action": action, "name": name, "reason": _as_str(data.get("reason", ""))}
+
+
 def _load_json(path: Path, *, required: bool = True) -> Dict[str, object]:
     """Load a JSON document from *path*.
 
@@ -136,22 +169,24 @@ def _load_json(path: Path, *, required: bool = True) -> Dict[str, object]:
         FileNotFoundError: If the file is missing and ``required`` is ``True``.
     """
 
-    if not path.exists():
+    try:
+        return jsonio.load_file(path)
+    except FileNotFoundError:
         if required:
-            raise FileNotFoundError(f"缺少输入文件: {path}")
+            raise FileNotFoundError(f"缺少输入文件: {path}") from None
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
 
 
 def _coerce_themes(raw: object) -> List[Dict[str, object]]:
     themes: List[Dict[str, object]] = []
     if isinstance(raw, list):
+        # Bind hot names locally; scores.json can carry hundreds of themes.
+        _isinstance, validate, append = isinstance, _validate_theme, themes.append
         for item in raw:
-            if not isinstance(item, Mapping):
+            if not _isinstance(item, dict):
                 continue
             try:
-                themes.append(ThemePayload.from_mapping(item).to_mapping())
+                append(validate(item))
             except ValueError:
                 continue
     return themes
@@ -161,51 +196,200 @@ def _coerce_actions(raw: object) -> List[Dict[str, str]]:
     actions: List[Dict[str, str]] = []
     if isinstance(raw, list):
         for item in raw:
-            if not isinstance(item, Mapping):
+            if not isinstance(item, dict):
                 continue
             try:
-                actions.append(ActionPayload.from_mapping(item).to_mapping())
+                actions.append(_validate_action(item))
             except ValueError:
                 continue
     return actions
 
 
-def _build_env() -> Environment:
+@lru_cache(maxsize=4)
+def _build_env(template_dir: Path) -> Environment:
+    """Build (once per template directory) the Jinja environment for the report.
+
+    Templates ship with the package, so ``auto_reload`` is off and the compiled
+    template stays in the environment's cache for every later render. Labels and
+    links that never change between runs are registered as globals rather than
+    passed in every render context.
+    """
+
     loaders = []
-    if TEMPLATE_DIR.exists():
-        loaders.append(FileSystemLoader(str(TEMPLATE_DIR)))
+    if template_dir.exists():
+        loaders.append(FileSystemLoader(str(template_dir)))
     loaders.append(PackageLoader("daily_messenger.digest", "templates"))
     loader = loaders[0] if len(loaders) == 1 else ChoiceLoader(loaders)
-    return Environment(loader=loader, autoescape=select_autoescape(["html", "xml"]))
+    # Only HTML templates live here, so escaping is unconditional.
+    env = Environment(loader=loader, autoescape=True, auto_reload=False)
+    env.globals.update(
+        metric_labels=METRIC_LABELS,
+        sentiment_labels=SENTIMENT_LABELS,
+        raw_links=RAW_LINKS,
+    )
+    return env
+
+
+def _report_template() -> Template:
+    return _build_env(TEMPLATE_DIR).get_template("report.html.j2")
+
+
+def _render_report(payload: Dict[str, object], path: Path) -> None:
+    """Stream the rendered report into *path* instead of building one string.
 
+    Output goes to a temporary file beside *path* that only replaces it once
+    rendering finishes, so a template error never leaves a truncated report.
+    """
+
+    stream = _report_template().stream(**payload)
+    stream.enable_buffering(size=64)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as fp:
+        tmp_path = Path(fp.name)
+        try:
+            stream.dump(fp, encoding="utf-8")
+        except BaseException:
+            fp.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    # Temporary files are created 0600; published reports must stay readable.
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
 
-def _render_report(env: Environment, payload: Dict[str, object]) -> str:
-    template = env.get_template("report.html.j2")
-    return template.render(**payload)
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Expose *source* at *target* via a hardlink, copying when links are unsupported."""
+
+    try:
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _parse_day(text: str) -> date:
+    """Parse ``YYYY-MM-DD`` text, also accepting unpadded ``2024-9-5``.
+
+    ``date.fromisoformat`` handles the common padded form in C; ``strptime``
+    keeps the looser month/day widths the digest has always accepted.
+    """
+
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        return datetime.strptime(text, "%Y-%m-%d").date()
 
 
 def _filter_future_events(
     events: List[Dict[str, object]], today: date
 ) -> List[Dict[str, object]]:
-    future: List[Dict[str, object]] = []
+    future: List[Tuple[date, Dict[str, object]]] = []
+    _str, _isinstance = _as_str, isinstance
+    parse_date, append = _parse_day, future.append
     for entry in events:
-        if not isinstance(entry, dict):
+        if not _isinstance(entry, dict):
             continue
         raw_date = entry.get("date")
         if not raw_date:
             continue
         try:
-            event_date = datetime.strptime(str(raw_date), "%Y-%m-%d").date()
+            event_date = parse_date(_str(raw_date))
         except ValueError:
             continue
         if event_date >= today:
-            item = dict(entry)
-            item["_date_obj"] = event_date
-            future.append(item)
-    future.sort(key=lambda item: item["_date_obj"])
-    for item in future:
-        item.pop("_date_obj", None)
-    return future[:20]
+            append((event_date, entry))
+    # Sort on the parsed date only; the stable sort keeps input order on ties.
+    future.sort(key=itemgetter(0))
+    return [entry for _, entry in future[:20]]
+
+
+SUMMARY_MAX_LINES = 12
+# Below this many symbols heapq beats the NumPy conversion overhead.
+VECTOR_RANK_MIN = 32
+
+
+_NUMBER = (int, float)
+
+
+def _move_score(pair: Tuple[float, Dict[str, Any]]) -> float:
+    score = pair[0]
+    return score if score == score else 0.0
+
+
+def _largest_moves(
+    ranked: List[Tuple[float, Dict[str, Any]]], count: int
+) -> List[Dict[str, Any]]:
+    """Return the items of the *count* largest scores in *ranked*.
+
+    Matches ``heapq.nlargest`` ordering, including ties resolved by input
+    position, while long lists are ranked with ``np.argpartition``. NaN
+    scores rank as 0.0 on both paths.
+    """
+
+    size = len(ranked)
+    if size < VECTOR_RANK_MIN or count >= size:
+        return [item for _, item in heapq.nlargest(count, ranked, key=_move_score)]
+    scores = np.fromiter((score for score, _ in ranked), dtype=np.float64, count=size)
+    # A NaN cutoff would match nothing in the > / == selections below.
+    scores[np.isnan(scores)] = 0.0
+    cutoff = scores[np.argpartition(scores, size - count)[size - count]]
+    above = np.flatnonzero(scores > cutoff)
+    ties = np.flatnonzero(scores == cutoff)[: count - above.size]
+    picked = np.concatenate((above, ties))
+    picked = picked[np.lexsort((picked, -scores[picked]))]
+    return [ranked[index][1] for index in picked]
+
+
+@lru_cache(maxsize=None)
+def _theme_line_format(shape: int) -> str:
+    """Return the ``str.format`` template for a theme line of *shape*.
+
+    *shape* is a bitmask of the optional fields present on the theme, so each
+    distinct layout is assembled once and reused for every theme sharing it.
+    """
+
+    head = "{label} 总分 " + ("{total:.0f}" if shape & 1 else "—")
+    if shape & 2:
+        head += " (Δ {delta:+.1f})"
+    parts = [head]
+    if shape & 4:
+        parts.append("基本面 {fundamental:.0f}")
+    if shape & 8:
+        parts.append("估值 ∅")
+    elif shape & 16:
+        parts.append("估值 {valuation:.0f}")
+    if shape & 32:
+        parts.append("距增持 {distance_to_add:+.0f}")
+    return "｜".join(parts)
+
+
+def _format_theme_line(theme: Mapping[str, Any]) -> str:
+    breakdown = theme.get("breakdown", {})
+    detail = theme.get("breakdown_detail", {})
+    meta = theme.get("meta", {})
+    total = theme.get("total")
+    delta = meta.get("delta")
+    fundamental = breakdown.get("fundamental")
+    valuation = breakdown.get("valuation")
+    distance_to_add = meta.get("distance_to_add")
+    shape = (
+        isinstance(total, _NUMBER)
+        | isinstance(delta, _NUMBER) << 1
+        | isinstance(fundamental, _NUMBER) << 2
+        | bool(detail.get("valuation", {}).get("fallback")) << 3
+        | isinstance(valuation, _NUMBER) << 4
+        | isinstance(distance_to_add, _NUMBER) << 5
+    )
+    return _theme_line_format(shape).format(
+        label=theme.get("label", theme.get("name", "主题")),
+        total=total,
+        delta=delta,
+        fundamental=fundamental,
+        valuation=valuation,
+        distance_to_add=distance_to_add,
+    )
 
 
 def _build_summary_lines(
@@ -214,38 +398,12 @@ def _build_summary_lines(
     lines = []
     if degraded:
         lines.append("⚠️ 数据延迟，以下为中性参考。")
-    for theme in themes:
-        label = theme.get("label", theme.get("name", "主题"))
-        breakdown = theme.get("breakdown", {})
-        detail = theme.get("breakdown_detail", {})
-        meta = theme.get("meta", {})
-        total = theme.get("total")
-        if isinstance(total, (int, float)):
-            line = f"{label} 总分 {total:.0f}"
-        else:
-            line = f"{label} 总分 —"
-        delta = meta.get("delta")
-        if isinstance(delta, (int, float)):
-            line += f" (Δ {delta:+.1f})"
-        fundamental = breakdown.get("fundamental")
-        if isinstance(fundamental, (int, float)):
-            line += f"｜基本面 {fundamental:.0f}"
-        valuation_detail = detail.get("valuation", {})
-        valuation_value = breakdown.get("valuation")
-        if valuation_detail.get("fallback"):
-            line += "｜估值 ∅"
-        elif isinstance(valuation_value, (int, float)):
-            line += f"｜估值 {valuation_value:.0f}"
-        distance_to_add = meta.get("distance_to_add")
-        if isinstance(distance_to_add, (int, float)):
-            line += f"｜距增持 {distance_to_add:+.0f}"
-        lines.append(line)
-    if actions:
-        for action in actions:
-            lines.append(
-                f"操作：{action['action']} {action['name']}（{action['reason']}）"
-            )
-    return lines[:12]
+    # Only SUMMARY_MAX_LINES lines are kept, so stop formatting once they exist.
+    for theme in themes[: SUMMARY_MAX_LINES - len(lines)]:
+        lines.append(_format_theme_line(theme))
+    for action in actions[: SUMMARY_MAX_LINES - len(lines)]:
+        lines.append(f"操作：{action['action']} {action['name']}（{action['reason']}）")
+    return lines
 
 
 def _build_market_news_sections(
@@ -327,16 +485,18 @@ def _build_card_payload(
         }
     ]
 
-    preview_chunks: List[str] = []
-    if news_preview:
-        preview_chunks.append("**新闻** " + " ｜ ".join(news_preview))
-    if stock_preview:
-        preview_chunks.append("**成分股** " + " ｜ ".join(stock_preview))
-    if preview_chunks:
+    news_chunk = "**新闻** " + " ｜ ".join(news_preview) if news_preview else ""
+    stock_chunk = "**成分股** " + " ｜ ".join(stock_preview) if stock_preview else ""
+    # Usually only one preview is present; skip the list and second join then.
+    if news_chunk and stock_chunk:
+        preview_content = f"{news_chunk}\n{stock_chunk}"
+    else:
+        preview_content = news_chunk or stock_chunk
+    if preview_content:
         elements.append(
             {
                 "tag": "div",
-                "text": {"tag": "lark_md", "content": "\n".join(preview_chunks)},
+                "text": {"tag": "lark_md", "content": preview_content},
             }
         )
 
@@ -384,44 +544,42 @@ def run(argv: List[str] | None = None) -> int:
     parser.add_argument("--degraded", action="store_true", help="强制输出降级版本")
     args = parser.parse_args(argv)
 
-    logger = setup_logger("digest")
     started_at = datetime.now(timezone.utc)
 
     scores = _load_json(OUT_DIR / "scores.json")
     actions_payload = _load_json(OUT_DIR / "actions.json")
+    # The logger is configured once the report date is known, so missing
+    # optional inputs are collected here and reported afterwards.
+    missing_inputs: List[Tuple[str, Path]] = []
     raw_market_path = OUT_DIR / "raw_market.json"
-    if raw_market_path.exists():
+    try:
         raw_market_payload = _load_json(raw_market_path)
-    else:
-        log(
-            logger,
-            logging.WARNING,
-            "digest_missing_input",
-            input="raw_market",
-            path=str(raw_market_path),
-        )
+    except FileNotFoundError:
+        missing_inputs.append(("raw_market", raw_market_path))
         raw_market_payload = {}
     raw_events_path = OUT_DIR / "raw_events.json"
-    if raw_events_path.exists():
+    try:
         raw_events_payload = _load_json(raw_events_path)
-    else:
-        log(
-            logger,
-            logging.WARNING,
-            "digest_missing_input",
-            input="raw_events",
-            path=str(raw_events_path),
-        )
+    except FileNotFoundError:
+        missing_inputs.append(("raw_events", raw_events_path))
         raw_events_payload = {}
 
     degraded = bool(scores.get("degraded")) or args.degraded
     date_str = scores.get("date", datetime.now(timezone.utc).strftime("%Y-%m-%d"))
     try:
-        report_date = datetime.strptime(str(date_str), "%Y-%m-%d").date()
+        report_date = _parse_day(_as_str(date_str))
     except ValueError:
         report_date = datetime.now(timezone.utc).date()
 
     logger = setup_logger("digest", date=date_str)
+    for input_name, input_path in missing_inputs:
+        log(
+            logger,
+            logging.WARNING,
+            "digest_missing_input",
+            input=input_name,
+            path=str(input_path),
+        )
     log(logger, logging.INFO, "digest_start", degraded=degraded)
     run_meta.record_step(OUT_DIR, "digest", "started", date=date_str, degraded=degraded)
 
@@ -442,37 +600,37 @@ def run(argv: List[str] | None = None) -> int:
     thresholds = thresholds_candidate if isinstance(thresholds_candidate, dict) else {}
 
     theme_details_candidate = scores.get("theme_details")
-    if isinstance(theme_details_candidate, Mapping):
+    if isinstance(theme_details_candidate, dict):
         theme_details = dict(theme_details_candidate)
     else:
         market_node = (
             raw_market_payload.get("market", {})
-            if isinstance(raw_market_payload, Mapping)
+            if isinstance(raw_market_payload, dict)
             else {}
         )
         details_node = (
-            market_node.get("themes") if isinstance(market_node, Mapping) else {}
+            market_node.get("themes") if isinstance(market_node, dict) else {}
         )
-        theme_details = dict(details_node) if isinstance(details_node, Mapping) else {}
+        theme_details = dict(details_node) if isinstance(details_node, dict) else {}
 
     ai_updates_candidate = scores.get("ai_updates")
     if isinstance(ai_updates_candidate, list):
         ai_updates = [
-            item for item in ai_updates_candidate if isinstance(item, Mapping)
+            item for item in ai_updates_candidate if isinstance(item, dict)
         ]
     else:
         candidate = (
             raw_events_payload.get("ai_updates")
-            if isinstance(raw_events_payload, Mapping)
+            if isinstance(raw_events_payload, dict)
             else []
         )
         if not isinstance(candidate, list):
             candidate = []
-        ai_updates = [item for item in candidate if isinstance(item, Mapping)]
+        ai_updates = [item for item in candidate if isinstance(item, dict)]
 
     news_preview: List[str] = []
     for entry in ai_updates[:3]:
-        title = str(entry.get("title", "更新"))
+        title = _as_str(entry.get("title", "更新"))
         url = entry.get("url")
         if isinstance(url, str) and url:
             news_preview.append(f"[{title}]({url})")
@@ -485,16 +643,16 @@ def run(argv: List[str] | None = None) -> int:
         selected_detail: Mapping[str, Any] | None = None
         for key in preferred_order:
             detail_candidate = (
-                theme_details.get(key) if isinstance(theme_details, Mapping) else None
+                theme_details.get(key) if isinstance(theme_details, dict) else None
             )
-            if isinstance(detail_candidate, Mapping) and detail_candidate.get(
+            if isinstance(detail_candidate, dict) and detail_candidate.get(
                 "symbols"
             ):
                 selected_detail = detail_candidate
                 break
         if selected_detail is None:
             for detail_candidate in theme_details.values():
-                if isinstance(detail_candidate, Mapping) and detail_candidate.get(
+                if isinstance(detail_candidate, dict) and detail_candidate.get(
                     "symbols"
                 ):
                     selected_detail = detail_candidate
@@ -504,21 +662,18 @@ def run(argv: List[str] | None = None) -> int:
             if isinstance(symbols_list, list):
                 sortable = []
                 for item in symbols_list:
-                    if isinstance(item, Mapping):
+                    # Entries without a symbol are never rendered; skip ranking them.
+                    if isinstance(item, dict) and item.get("symbol"):
                         change_value = item.get("change_pct")
                         try:
                             change_float = float(change_value)
                         except (TypeError, ValueError):
                             change_float = 0.0
                         sortable.append((abs(change_float), item))
-                for _, item in sorted(sortable, key=lambda pair: pair[0], reverse=True)[
-                    :3
-                ]:
-                    symbol = item.get("symbol")
-                    if not symbol:
-                        continue
+                for item in _largest_moves(sortable, 3):
+                    symbol = item["symbol"]
                     change_value = item.get("change_pct")
-                    preview_text = str(symbol)
+                    preview_text = _as_str(symbol)
                     try:
                         change_float = float(change_value)
                     except (TypeError, ValueError):
@@ -535,12 +690,9 @@ def run(argv: List[str] | None = None) -> int:
                             preview_text += f" {price_float:.2f}"
                     stock_preview.append(preview_text)
 
-    raw_links = {"market": "raw_market.json", "events": "raw_events.json"}
     news_sections = _build_market_news_sections(ai_updates)
     news_text = _build_market_news_text(ai_updates, news_sections)
 
-    env = _build_env()
-
     payload = {
         "title": f"盘前播报{'（数据延迟）' if degraded else ''}",
         "date": date_str,
@@ -550,23 +702,18 @@ def run(argv: List[str] | None = None) -> int:
         "etl_sources": etl_sources,
         "sentiment": sentiment_detail,
         "thresholds": thresholds,
-        "metric_labels": METRIC_LABELS,
-        "sentiment_labels": SENTIMENT_LABELS,
         "degraded": degraded,
         "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
         "theme_details": theme_details,
         "ai_updates": ai_updates,
         "news_sections": news_sections,
         "news_text": news_text,
-        "raw_links": raw_links,
     }
 
-    html = _render_report(env, payload)
-
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     dated_report_path = OUT_DIR / f"{date_str}.html"
-    dated_report_path.write_text(html, encoding="utf-8")
-    (OUT_DIR / "index.html").write_text(html, encoding="utf-8")
+    _render_report(payload, dated_report_path)
+    _link_or_copy(dated_report_path, OUT_DIR / "index.html")
 
     summary_lines = _build_summary_lines(
         payload["themes"], payload["actions"], degraded
@@ -574,9 +721,11 @@ def run(argv: List[str] | None = None) -> int:
     summary_text = "\n".join(summary_lines)
     if summary_text:
         summary_text += "\n"
-    (OUT_DIR / "digest_summary.txt").write_text(summary_text, encoding="utf-8")
+    # Encode once and skip the text layer, which also keeps LF line endings on
+    # every platform.
+    (OUT_DIR / "digest_summary.txt").write_bytes(summary_text.encode("utf-8"))
 
-    (OUT_DIR / "digest_news.txt").write_text(news_text, encoding="utf-8")
+    (OUT_DIR / "digest_news.txt").write_bytes(news_text.encode("utf-8"))
 
     repo = os.getenv("GITHUB_REPOSITORY", "org/repo")
     owner, repo_name = repo.split("/") if "/" in repo else ("org", repo)
@@ -603,9 +752,7 @@ def run(argv: List[str] | None = None) -> int:
         stock_preview=stock_preview,
         news_full_md=news_full_md if news_full_md else None,
     )
-    (OUT_DIR / "digest_card.json").write_text(
-        json.dumps(card_payload, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    (OUT_DIR / "digest_card.json").write_bytes(jsonio.dumps_pretty(card_payload))
 
     duration = (datetime.now(timezone.utc) - started_at).total_seconds()
     log(
@@ -2,7 +2,7 @@
 """
 Generate technical analysis report for commodities (default XAU/USD) using OANDA data.
 
-This module keeps dependencies lightweight by relying on the standard library only.
+This module keeps dependencies lightweight: requests, PyYAML, NumPy and pandas.
 It pulls OANDA midpoint candles, computes SMA/RSI/ATR plus daily pivot levels,
 and renders a Markdown report that mirrors the existing digest structure.
 """
@@ -13,14 +13,29 @@ import argparse
 import math
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, List, Optional, Sequence
 
+import numpy as np
+import pandas as pd
 import requests
 import yaml
 
+from daily_messenger.common import jsonio
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional on Python 3.13+
+    pa = None
+    pq = None
+
+_SESSION: Optional[requests.Session] = None
+
 
 @dataclass
 class Candle:
@@ -35,6 +50,84 @@ class Candle:
     volume: int
 
 
+@dataclass
+class CandleSeries:
+    """Columnar candles: one NumPy array per field, ordered by time.
+
+    ``time`` holds naive UTC ``datetime64[us]`` values.
+    """
+
+    time: np.ndarray
+    complete: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.close.size)
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> "CandleSeries":
+        size = len(candles)
+        return cls(
+            time=np.array(
+                [c.time.astimezone(timezone.utc).replace(tzinfo=None) for c in candles],
+                dtype="datetime64[us]",
+            ),
+            complete=np.fromiter((c.complete for c in candles), dtype=bool, count=size),
+            open=np.fromiter((c.open for c in candles), dtype=np.float64, count=size),
+            high=np.fromiter((c.high for c in candles), dtype=np.float64, count=size),
+            low=np.fromiter((c.low for c in candles), dtype=np.float64, count=size),
+            close=np.fromiter((c.close for c in candles), dtype=np.float64, count=size),
+            volume=np.fromiter((c.volume for c in candles), dtype=np.int64, count=size),
+        )
+
+    def take(self, order: np.ndarray) -> "CandleSeries":
+        """Return the rows at *order* as a new series."""
+        return CandleSeries(
+            time=self.time[order],
+            complete=self.complete[order],
+            open=self.open[order],
+            high=self.high[order],
+            low=self.low[order],
+            close=self.close[order],
+            volume=self.volume[order],
+        )
+
+    def append(self, other: "CandleSeries") -> "CandleSeries":
+        """Return this series followed by the rows of *other*."""
+        return CandleSeries(
+            time=np.concatenate((self.time, other.time)),
+            complete=np.concatenate((self.complete, other.complete)),
+            open=np.concatenate((self.open, other.open)),
+            high=np.concatenate((self.high, other.high)),
+            low=np.concatenate((self.low, other.low)),
+            close=np.concatenate((self.close, other.close)),
+            volume=np.concatenate((self.volume, other.volume)),
+        )
+
+    def last_complete_index(self) -> int | None:
+        """Index of the newest completed candle, or ``None`` if there is none."""
+        # argmax on a reversed bool view stops at the first True from the end.
+        flags = self.complete[::-1]
+        position = int(flags.argmax()) if flags.size else 0
+        if not flags.size or not flags[position]:
+            return None
+        return flags.size - 1 - position
+
+    def timestamp(self, index: int) -> datetime:
+        """Return the candle time at *index* as an aware UTC datetime."""
+        return self.time[index].item().replace(tzinfo=timezone.utc)
+
+
+def _as_series(candles: CandleSeries | Sequence[Candle]) -> CandleSeries:
+    if isinstance(candles, CandleSeries):
+        return candles
+    return CandleSeries.from_candles(candles)
+
+
 @dataclass
 class WindowsConfig:
     sma_fast: int
@@ -65,17 +158,41 @@ class TAReportConfig:
     report: ReportOutputConfig
     alignment_timezone: str | None = None
     daily_alignment: int | None = None
+    cache_dir: str | None = None
 
 
 class ConfigError(RuntimeError):
     """Raised when configuration is invalid."""
 
 
+def _get_session() -> requests.Session:
+    """Return the shared session so OANDA requests reuse one connection."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+    return _SESSION
+
+
 def _parse_time(value: str) -> datetime:
     """Convert OANDA time strings into timezone-aware UTC datetimes."""
     if value.endswith("Z"):
-        value = value[:-1] + "+00:00"
-    return datetime.fromisoformat(value).astimezone(timezone.utc)
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value)
+    if parsed.utcoffset() == timedelta(0):
+        return parsed
+    return parsed.astimezone(timezone.utc)
+
+
+def _utc_datetime64(value: str) -> str | datetime:
+    """Return a value assignable to a naive-UTC ``datetime64`` column.
+
+    OANDA's RFC3339 ``...Z`` strings are handed to NumPy's own parser, which
+    truncates the nanosecond fraction to the column unit; other offsets go
+    through :func:`_parse_time`.
+    """
+    if value.endswith("Z"):
+        return value[:-1]
+    return _parse_time(value).replace(tzinfo=None)
 
 
 def _coerce_float(raw: str | float | int) -> float:
@@ -89,12 +206,15 @@ def fetch_candles(
     count: int = 400,
     alignment_timezone: str | None = None,
     daily_alignment: int | None = None,
-) -> List[Candle]:
+    since: datetime | None = None,
+) -> CandleSeries:
     """
     Fetch midpoint candles from the OANDA REST API.
 
     Parameters mirror the upstream REST interface. Daily/weekly/monthly requests
-    accept alignment hints to roll the session at 17:00 New York time.
+    accept alignment hints to roll the session at 17:00 New York time. With
+    ``since`` the request returns up to ``count`` candles starting at that time
+    instead of the newest ``count``.
     """
 
     url = f"https://api-fxpractice.oanda.com/v3/instruments/{instrument}/candles"
@@ -103,6 +223,10 @@ def fetch_candles(
         "count": count,
         "price": "M",
     }
+    if since is not None:
+        params["from"] = since.astimezone(timezone.utc).isoformat().replace(
+            "+00:00", "Z"
+        )
     if granularity.startswith("D") or granularity in {"W", "M"}:
         if alignment_timezone:
             params["alignmentTimezone"] = alignment_timezone
@@ -110,125 +234,231 @@ def fetch_candles(
             params["dailyAlignment"] = daily_alignment
 
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(url, headers=headers, params=params, timeout=20)
+    response = _get_session().get(url, headers=headers, params=params, timeout=20)
     response.raise_for_status()
-    payload = response.json()
-    candles: List[Candle] = []
-    for item in payload.get("candles", []):
+    payload = jsonio.loads(response.content)
+    items = payload.get("candles", [])
+    # Fill preallocated columns in place; rows without midpoints are skipped
+    # and the unused tail is sliced off afterwards.
+    capacity = len(items)
+    times = np.empty(capacity, dtype="datetime64[us]")
+    complete = np.empty(capacity, dtype=bool)
+    ohlc = np.empty((capacity, 4), dtype=np.float64)
+    volumes = np.empty(capacity, dtype=np.int64)
+    size = 0
+    for item in items:
         mid = item.get("mid")
         if not mid:
             continue
-        candles.append(
-            Candle(
-                time=_parse_time(item["time"]),
-                complete=bool(item.get("complete", False)),
-                open=_coerce_float(mid["o"]),
-                high=_coerce_float(mid["h"]),
-                low=_coerce_float(mid["l"]),
-                close=_coerce_float(mid["c"]),
-                volume=int(item.get("volume", 0)),
-            )
+        times[size] = _utc_datetime64(item["time"])
+        complete[size] = bool(item.get("complete", False))
+        ohlc[size] = (
+            _coerce_float(mid["o"]),
+            _coerce_float(mid["h"]),
+            _coerce_float(mid["l"]),
+            _coerce_float(mid["c"]),
         )
-    candles.sort(key=lambda c: c.time)
-    if not candles:
+        volumes[size] = int(item.get("volume", 0))
+        size += 1
+    if not size:
         raise RuntimeError(f"No candles returned for {instrument} {granularity}")
-    return candles
+    series = CandleSeries(
+        time=times[:size],
+        complete=complete[:size],
+        open=ohlc[:size, 0],
+        high=ohlc[:size, 1],
+        low=ohlc[:size, 2],
+        close=ohlc[:size, 3],
+        volume=volumes[:size],
+    )
+    # OANDA returns candles in chronological order; only reorder if it did not.
+    if size > 1 and (np.diff(series.time) < np.timedelta64(0, "us")).any():
+        series = series.take(np.argsort(series.time, kind="stable"))
+    return series
+
+
+def _cache_path(cache_dir: Path, instrument: str, granularity: str) -> Path:
+    return cache_dir / f"{instrument}_{granularity}.parquet"
+
+
+def _read_cached_series(path: Path) -> CandleSeries | None:
+    """Load a cached series, treating missing or unreadable files as a miss."""
+    try:
+        table = pq.read_table(path)
+        return CandleSeries(
+            time=table.column("time").to_numpy().astype("datetime64[us]"),
+            complete=table.column("complete").to_numpy(),
+            open=table.column("open").to_numpy(),
+            high=table.column("high").to_numpy(),
+            low=table.column("low").to_numpy(),
+            close=table.column("close").to_numpy(),
+            volume=table.column("volume").to_numpy(),
+        )
+    except (OSError, KeyError, pa.ArrowException):
+        return None
+
+
+def _write_cached_series(path: Path, series: CandleSeries) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.table(
+        {
+            "time": series.time,
+            "complete": series.complete,
+            "open": series.open,
+            "high": series.high,
+            "low": series.low,
+            "close": series.close,
+            "volume": series.volume,
+        }
+    )
+    pq.write_table(table, path, compression="zstd")
 
 
-def _moving_average(values: Sequence[float], window: int) -> List[float]:
+def fetch_candles_cached(
+    cache_dir: Path,
+    instrument: str,
+    granularity: str,
+    token: str,
+    count: int = 400,
+    **kwargs: object,
+) -> CandleSeries:
+    """Fetch candles, reusing the completed history cached under *cache_dir*.
+
+    Only candles from the newest cached complete bar onwards are requested. If
+    that page comes back full, the gap is too large to bridge and the newest
+    ``count`` candles are fetched instead. The newest ``count`` rows are kept.
+    """
+    path = _cache_path(cache_dir, instrument, granularity)
+    cached = _read_cached_series(path)
+    last_complete = cached.last_complete_index() if cached is not None else None
+    series: CandleSeries | None = None
+    if cached is not None and last_complete is not None:
+        since = cached.timestamp(last_complete)
+        fresh = fetch_candles(
+            instrument, granularity, token, count=count, since=since, **kwargs
+        )
+        if len(fresh) < count:
+            older = cached.take(np.flatnonzero(cached.time < fresh.time[0]))
+            series = older.append(fresh)
+    if series is None:
+        series = fetch_candles(instrument, granularity, token, count=count, **kwargs)
+    if len(series) > count:
+        series = series.take(np.arange(len(series) - count, len(series)))
+    _write_cached_series(path, series)
+    return series
+
+
+def _moving_average(values: Sequence[float], window: int) -> np.ndarray:
     """Simple moving average with NaN padding while window is not filled."""
     if window <= 0:
         raise ValueError("window must be > 0")
-    out = [math.nan] * len(values)
-    window_sum = 0.0
-    for idx, value in enumerate(values):
-        window_sum += value
-        if idx >= window:
-            window_sum -= values[idx - window]
-        if idx >= window - 1:
-            out[idx] = window_sum / window
+    arr = np.asarray(values, dtype=np.float64)
+    out = np.full(arr.shape, np.nan)
+    if arr.size >= window:
+        cumulative = np.concatenate(([0.0], np.cumsum(arr)))
+        out[window - 1 :] = (cumulative[window:] - cumulative[:-window]) / window
     return out
 
 
-def _relative_strength_index(values: Sequence[float], window: int) -> List[float]:
+def _wilder_rsi(changes: np.ndarray, window: int) -> np.ndarray:
+    """RSI values from bar-to-bar *changes*, starting at bar ``window``."""
+    moves = np.column_stack((np.maximum(changes, 0.0), np.maximum(-changes, 0.0)))
+    # Wilder smoothing is an EWMA with alpha=1/window seeded by the simple mean
+    # of the first window of moves; gains and losses are smoothed together.
+    seeded = np.vstack((moves[:window].mean(axis=0), moves[window:]))
+    smoothed = (
+        pd.DataFrame(seeded).ewm(alpha=1.0 / window, adjust=False).mean().to_numpy()
+    )
+    avg_gain = smoothed[:, 0]
+    avg_loss = smoothed[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi[avg_loss == 0] = 100.0
+    rsi[(avg_loss == 0) & (avg_gain == 0)] = 50.0
+    return rsi
+
+
+def _relative_strength_index(values: Sequence[float], window: int) -> np.ndarray:
     """Compute RSI with Wilder smoothing."""
     if window <= 0:
         raise ValueError("window must be > 0")
-    out = [math.nan] * len(values)
-    if len(values) <= window:
+    arr = np.asarray(values, dtype=np.float64)
+    out = np.full(arr.shape, np.nan)
+    if arr.size <= window:
         return out
-
-    gains: List[float] = []
-    losses: List[float] = []
-    for idx in range(1, window + 1):
-        change = values[idx] - values[idx - 1]
-        gains.append(max(change, 0.0))
-        losses.append(max(-change, 0.0))
-
-    avg_gain = sum(gains) / window
-    avg_loss = sum(losses) / window
-    if avg_loss == 0 and avg_gain == 0:
-        out[window] = 50.0
-    elif avg_loss == 0:
-        out[window] = 100.0
-    else:
-        rs = avg_gain / avg_loss
-        out[window] = 100.0 - (100.0 / (1.0 + rs))
-
-    for idx in range(window + 1, len(values)):
-        change = values[idx] - values[idx - 1]
-        gain = max(change, 0.0)
-        loss = max(-change, 0.0)
-        avg_gain = ((avg_gain * (window - 1)) + gain) / window
-        avg_loss = ((avg_loss * (window - 1)) + loss) / window
-        if avg_loss == 0 and avg_gain == 0:
-            out[idx] = 50.0
-        elif avg_loss == 0:
-            out[idx] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            out[idx] = 100.0 - (100.0 / (1.0 + rs))
+    out[window:] = _wilder_rsi(np.diff(arr), window)
     return out
 
 
-def _average_true_range(candles: Sequence[Candle], window: int) -> List[float]:
+def _true_range(candles: CandleSeries) -> np.ndarray:
+    """Per-bar true range; the first bar falls back to its high-low range."""
+    high = candles.high
+    low = candles.low
+    prev_close = candles.close[:-1]
+    true_range = high - low
+    true_range[1:] = np.maximum.reduce(
+        (
+            true_range[1:],
+            np.abs(high[1:] - prev_close),
+            np.abs(low[1:] - prev_close),
+        )
+    )
+    return true_range
+
+
+def _average_true_range(candles: CandleSeries, window: int) -> np.ndarray:
     """Average true range using a simple moving average of TR values."""
     if window <= 0:
         raise ValueError("window must be > 0")
-    out = [math.nan] * len(candles)
-    if not candles:
-        return out
+    if not len(candles):
+        return np.full(0, np.nan)
+    return _moving_average(_true_range(candles), window)
 
-    tr_values: List[float] = []
-    window_sum = 0.0
-    for idx, candle in enumerate(candles):
-        if idx == 0:
-            true_range = candle.high - candle.low
-        else:
-            prev_close = candles[idx - 1].close
-            true_range = max(
-                candle.high - candle.low,
-                abs(candle.high - prev_close),
-                abs(candle.low - prev_close),
-            )
-        tr_values.append(true_range)
-        window_sum += true_range
-        if idx >= window:
-            window_sum -= tr_values[idx - window]
-        if idx >= window - 1:
-            out[idx] = window_sum / window
-    return out
 
+def _terminal_indicators(
+    candles: CandleSeries, windows: WindowsConfig
+) -> dict[str, float]:
+    """Return the latest SMA/RSI/ATR values without building full series.
 
-def _pivot_levels(daily_candles: Sequence[Candle]) -> dict[str, float]:
+    The report only reads the last bar of each indicator, so the SMAs share
+    one cumulative sum over closes and ATR averages only the trailing TR
+    window. Values match the last element of the series helpers.
+    """
+    for window in (windows.sma_fast, windows.sma_slow, windows.rsi, windows.atr):
+        if window <= 0:
+            raise ValueError("window must be > 0")
+    closes = candles.close
+    size = closes.size
+    cumulative = np.concatenate(([0.0], np.cumsum(closes)))
+
+    def _last_sma(window: int) -> float:
+        if size < window:
+            return math.nan
+        return float((cumulative[-1] - cumulative[-1 - window]) / window)
+
+    rsi = math.nan
+    if size > windows.rsi:
+        rsi = float(_wilder_rsi(np.diff(closes), windows.rsi)[-1])
+    atr = math.nan
+    if size >= windows.atr:
+        atr = float(_true_range(candles)[-windows.atr :].mean())
+    return {
+        "sma_fast": _last_sma(windows.sma_fast),
+        "sma_slow": _last_sma(windows.sma_slow),
+        "rsi": rsi,
+        "atr": atr,
+    }
+
+
+def _pivot_levels(daily_candles: CandleSeries) -> dict[str, float]:
     """Return classic floor-trader pivot levels based on the last completed day."""
-    last_complete = next((c for c in reversed(daily_candles) if c.complete), None)
-    if not last_complete:
+    last_complete = daily_candles.last_complete_index()
+    if last_complete is None:
         raise RuntimeError("No completed candle available for pivot calculation")
 
-    high = last_complete.high
-    low = last_complete.low
-    close = last_complete.close
+    high = float(daily_candles.high[last_complete])
+    low = float(daily_candles.low[last_complete])
+    close = float(daily_candles.close[last_complete])
     pivot = (high + low + close) / 3.0
     price_range = high - low
     return {
@@ -253,33 +483,28 @@ def _format_price(value: float) -> str:
     return f"{value:,.2f}"
 
 
-def _is_finite(value: float) -> bool:
-    return not math.isnan(value) and not math.isinf(value)
-
-
 def _latest_price_from_intraday(
-    intraday: dict[str, Sequence[Candle]], fallback: float
+    intraday: dict[str, CandleSeries], fallback: float
 ) -> float:
     for granularity in ("M5", "M15", "H1", "H4"):
         candles = intraday.get(granularity)
-        if candles:
-            return candles[-1].close
+        if candles is not None and len(candles):
+            return float(candles.close[-1])
     for candles in intraday.values():
-        if candles:
-            return candles[-1].close
+        if len(candles):
+            return float(candles.close[-1])
     return fallback
 
 
-def _render_intraday_lines(intraday: dict[str, Sequence[Candle]]) -> List[str]:
+def _render_intraday_lines(intraday: dict[str, CandleSeries]) -> List[str]:
     lines: List[str] = []
     for granularity in sorted(intraday):
         candles = intraday[granularity]
-        if not candles:
+        if not len(candles):
             continue
-        last = candles[-1]
-        timestamp = last.time.strftime("%Y-%m-%d %H:%M UTC")
+        timestamp = candles.timestamp(-1).strftime("%Y-%m-%d %H:%M UTC")
         lines.append(
-            f"- {granularity} 最新价：{_format_price(last.close)} （{timestamp}）"
+            f"- {granularity} 最新价：{_format_price(candles.close[-1])} （{timestamp}）"
         )
     return lines
 
@@ -293,13 +518,13 @@ def _build_suggestions(
     pivot_hits: list[str],
 ) -> List[str]:
     suggestions: List[str] = []
-    if _is_finite(rsi_value):
+    if math.isfinite(rsi_value):
         if rsi_value <= thresholds.rsi_oversold:
             suggestions.append("RSI 进入超卖区，结合支撑位判断反弹强度。")
         elif rsi_value >= thresholds.rsi_overbought:
             suggestions.append("RSI 进入超买区，警惕回撤并关注短均线防守。")
 
-    if _is_finite(sma_fast) and _is_finite(sma_slow):
+    if math.isfinite(sma_fast) and math.isfinite(sma_slow):
         if sma_fast > sma_slow:
             suggestions.append("均线呈金叉结构，中期动能改善。")
         elif sma_fast < sma_slow:
@@ -318,28 +543,25 @@ def _build_suggestions(
 
 
 def generate_report_markdown(
-    daily_candles: Sequence[Candle],
-    intraday: dict[str, Sequence[Candle]],
+    daily_candles: CandleSeries | Sequence[Candle],
+    intraday: dict[str, CandleSeries] | dict[str, Sequence[Candle]],
     cfg: TAReportConfig,
 ) -> str:
     """Render a Markdown report using daily indicators and optional intraday snapshot."""
-    closes = [c.close for c in daily_candles]
-    sma_fast_series = _moving_average(closes, cfg.windows.sma_fast)
-    sma_slow_series = _moving_average(closes, cfg.windows.sma_slow)
-    rsi_series = _relative_strength_index(closes, cfg.windows.rsi)
-    atr_series = _average_true_range(daily_candles, cfg.windows.atr)
+    daily_candles = _as_series(daily_candles)
+    intraday = {gran: _as_series(candles) for gran, candles in intraday.items()}
+    indicators = _terminal_indicators(daily_candles, cfg.windows)
     pivot_levels = _pivot_levels(daily_candles)
 
-    last_daily = daily_candles[-1]
-    last_price = last_daily.close
-    sma_fast_value = sma_fast_series[-1]
-    sma_slow_value = sma_slow_series[-1]
-    rsi_value = rsi_series[-1]
-    atr_value = atr_series[-1]
+    last_price = float(daily_candles.close[-1])
+    sma_fast_value = indicators["sma_fast"]
+    sma_slow_value = indicators["sma_slow"]
+    rsi_value = indicators["rsi"]
+    atr_value = indicators["atr"]
 
     cross_label = "数据不足"
     trend_label = "观察中"
-    if _is_finite(sma_fast_value) and _is_finite(sma_slow_value):
+    if math.isfinite(sma_fast_value) and math.isfinite(sma_slow_value):
         if sma_fast_value > sma_slow_value:
             cross_label = "金叉"
             trend_label = "偏多" if last_price > sma_fast_value else "回踩中"
@@ -350,10 +572,13 @@ def generate_report_markdown(
             cross_label = "均线粘合"
             trend_label = "盘整"
 
+    # Format every price once; the hit list and the report body share them.
+    pivot_text = {name: _format_price(value) for name, value in pivot_levels.items()}
     ref_price = _latest_price_from_intraday(intraday, last_price)
+    ref_text = _format_price(ref_price)
     monitored_levels = ["S2", "S1", "P", "R1", "R2", "prev_low", "prev_high"]
     pivot_hits = [
-        f"接近 {name}（{_format_price(pivot_levels[name])}），参考价 {_format_price(ref_price)}"
+        f"接近 {name}（{pivot_text[name]}），参考价 {ref_text}"
         for name in monitored_levels
         if _near_level(ref_price, pivot_levels[name], cfg.thresholds.near_pct)
     ]
@@ -375,29 +600,30 @@ def generate_report_markdown(
     report_lines.append(f"- 最新价（日线收盘）：{_format_price(last_price)}")
     report_lines.append("")
     report_lines.append("## 趋势概览")
-    report_lines.append(
-        f"- 日线均线：SMA{cfg.windows.sma_fast}={_format_price(sma_fast_value) if _is_finite(sma_fast_value) else 'N/A'}，"
-        f"SMA{cfg.windows.sma_slow}={_format_price(sma_slow_value) if _is_finite(sma_slow_value) else 'N/A'}，结构：{cross_label}，判定：{trend_label}"
+    windows = cfg.windows
+    sma_fast_display = (
+        _format_price(sma_fast_value) if math.isfinite(sma_fast_value) else "N/A"
     )
-    rsi_display = f"{rsi_value:.1f}" if _is_finite(rsi_value) else "N/A"
-    atr_display = f"{atr_value:.2f}" if _is_finite(atr_value) else "N/A"
-    report_lines.append(
-        f"- RSI{cfg.windows.rsi}：{rsi_display} | ATR{cfg.windows.atr}：{atr_display}"
+    sma_slow_display = (
+        _format_price(sma_slow_value) if math.isfinite(sma_slow_value) else "N/A"
     )
-    report_lines.append("")
-    report_lines.append("## 支撑与压力")
-    report_lines.append(f"- 枢轴点 P: {_format_price(pivot_levels['P'])}")
+    rsi_display = f"{rsi_value:.1f}" if math.isfinite(rsi_value) else "N/A"
+    atr_display = f"{atr_value:.2f}" if math.isfinite(atr_value) else "N/A"
     report_lines.append(
-        f"- S1: {_format_price(pivot_levels['S1'])} | S2: {_format_price(pivot_levels['S2'])}"
+        f"- 日线均线：SMA{windows.sma_fast}={sma_fast_display}，"
+        f"SMA{windows.sma_slow}={sma_slow_display}，结构：{cross_label}，判定：{trend_label}"
     )
     report_lines.append(
-        f"- R1: {_format_price(pivot_levels['R1'])} | R2: {_format_price(pivot_levels['R2'])}"
+        f"- RSI{windows.rsi}：{rsi_display} | ATR{windows.atr}：{atr_display}"
     )
+    report_lines.append("")
+    report_lines.append("## 支撑与压力")
+    report_lines.append(f"- 枢轴点 P: {pivot_text['P']}")
+    report_lines.append(f"- S1: {pivot_text['S1']} | S2: {pivot_text['S2']}")
+    report_lines.append(f"- R1: {pivot_text['R1']} | R2: {pivot_text['R2']}")
     report_lines.append(
         "- 昨日高/低/收: "
-        f"{_format_price(pivot_levels['prev_high'])} / "
-        f"{_format_price(pivot_levels['prev_low'])} / "
-        f"{_format_price(pivot_levels['prev_close'])}"
+        f"{pivot_text['prev_high']} / {pivot_text['prev_low']} / {pivot_text['prev_close']}"
     )
 
     if intraday_lines:
@@ -458,6 +684,7 @@ def _load_config(path: Path) -> TAReportConfig:
         alignment_timezone=raw.get("alignmentTimezone")
         or raw.get("alignment_timezone"),
         daily_alignment=raw.get("dailyAlignment") or raw.get("daily_alignment"),
+        cache_dir=raw.get("cacheDir") or raw.get("cache_dir"),
         windows=windows,
         thresholds=thresholds,
         report=report,
@@ -494,24 +721,36 @@ def run(argv: list[str] | None = None) -> int:
         print("请设置环境变量 OANDA_TOKEN=Practice Token", file=sys.stderr)
         return 2
 
+    grans = cfg.report.intraday_granularities if cfg.report.include_intraday else []
+    fetch = fetch_candles
+    if cfg.cache_dir:
+        if pq is None:
+            print("K 线缓存需要安装可选依赖 pyarrow，请先安装后重试。", file=sys.stderr)
+            return 2
+        fetch = partial(fetch_candles_cached, Path(cfg.cache_dir))
     try:
-        daily_candles = fetch_candles(
-            cfg.instrument,
-            "D",
-            token,
-            count=400,
-            alignment_timezone=cfg.alignment_timezone,
-            daily_alignment=int(cfg.daily_alignment)
-            if cfg.daily_alignment is not None
-            else None,
-        )
-        intraday: dict[str, List[Candle]] = {}
-        if cfg.report.include_intraday:
-            for gran in cfg.report.intraday_granularities:
+        # Daily and intraday requests are independent; fetch them concurrently.
+        with ThreadPoolExecutor(max_workers=min(8, len(grans) + 1)) as executor:
+            daily_future = executor.submit(
+                fetch,
+                cfg.instrument,
+                "D",
+                token,
+                count=400,
+                alignment_timezone=cfg.alignment_timezone,
+                daily_alignment=int(cfg.daily_alignment)
+                if cfg.daily_alignment is not None
+                else None,
+            )
+            intraday_futures = {
+                gran: executor.submit(fetch, cfg.instrument, gran, token, count=200)
+                for gran in grans
+            }
+            daily_candles = daily_future.result()
+            intraday: dict[str, CandleSeries] = {}
+            for gran, future in intraday_futures.items():
                 try:
-                    intraday[gran] = fetch_candles(
-                        cfg.instrument, gran, token, count=200
-                    )
+                    intraday[gran] = future.result()
                 except Exception as exc:  # pragma: no cover - network edge case
                     print(
                         f"获取 {cfg.instrument} {gran} 数据失败：{exc}", file=sys.stderr
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime as dt
+import io
 import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
@@ -16,6 +17,14 @@ USER_AGENT = (
 )
 REQUEST_TIMEOUT = 20
 RSS_URL = "https://insights.aaii.com/feed"
+SENTIMENT_LABELS = tuple(
+    re.compile(label, re.IGNORECASE) for label in ("Bullish", "Neutral", "Bearish")
+)
+PERCENT_PATTERN = re.compile(r"[^0-9]*([0-9]+(?:\.[0-9]+)?)%")
+WEEK_PATTERN = re.compile(
+    r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}",
+    re.IGNORECASE,
+)
 
 
 @dataclass
@@ -37,34 +46,37 @@ def _resolve_latest_story(session: requests.Session) -> Optional[str]:
         response.raise_for_status()
     except Exception:  # noqa: BLE001
         return None
+    # Stream the feed and stop at the first matching item instead of building
+    # the whole tree; raw bytes let the parser honour the XML encoding.
     try:
-        root = ET.fromstring(response.text)
+        for _, elem in ET.iterparse(io.BytesIO(response.content), events=("end",)):
+            if elem.tag != "item":
+                continue
+            title = (elem.findtext("title") or "").strip()
+            link = (elem.findtext("link") or "").strip()
+            if title and link and "Sentiment Survey" in title:
+                return link
+            elem.clear()
     except ET.ParseError:
         return None
-    channel = root.find("channel")
-    if channel is None:
-        return None
-    for item in channel.findall("item"):
-        title = (item.findtext("title") or "").strip()
-        link = (item.findtext("link") or "").strip()
-        if not title or not link:
-            continue
-        if "Sentiment Survey" in title:
-            return link
     return None
 
 
 def _parse_article(html: str) -> Optional[Dict[str, float]]:
-    pattern = re.compile(
-        r"(?is)Bullish[^0-9]*([0-9]+(?:\.[0-9]+)?)%.*?Neutral[^0-9]*([0-9]+(?:\.[0-9]+)?)%.*?Bearish[^0-9]*([0-9]+(?:\.[0-9]+)?)%"
-    )
-    match = pattern.search(html)
-    if not match:
-        return None
-    try:
-        bull, neutral, bear = (float(match.group(i)) for i in range(1, 4))
-    except ValueError:
-        return None
+    # Find each label in order, then read the first percentage after it. This
+    # stays linear on malformed pages, unlike one pattern with ``.*?`` spans.
+    values = []
+    position = 0
+    for label in SENTIMENT_LABELS:
+        for anchor in label.finditer(html, position):
+            match = PERCENT_PATTERN.match(html, anchor.end())
+            if match:
+                values.append(float(match.group(1)))
+                position = match.end()
+                break
+        else:
+            return None
+    bull, neutral, bear = values
     return {
         "bullish_pct": round(bull, 2),
         "neutral_pct": round(neutral, 2),
@@ -74,10 +86,7 @@ def _parse_article(html: str) -> Optional[Dict[str, float]]:
 
 
 def _parse_week(html: str) -> Optional[str]:
-    date_pattern = re.compile(
-        r"(?i)(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}"
-    )
-    match = date_pattern.search(html)
+    match = WEEK_PATTERN.search(html)
     if not match:
         return None
     try:
@@ -4,8 +4,8 @@ from __future__ import annotations
 
 import csv
 import datetime as dt
-import io
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -40,12 +40,10 @@ class FetchStatus:
 
 
 def _init_session() -> requests.Session:
+    # The CSV archives live on cdn.cboe.com and need no www.cboe.com cookies,
+    # so there is no warm-up request on the critical path.
     session = requests.Session()
     session.headers.update({"User-Agent": USER_AGENT})
-    try:
-        session.get("https://www.cboe.com", timeout=REQUEST_TIMEOUT)
-    except Exception:  # noqa: BLE001 - warm-up best effort
-        pass
     return session
 
 
@@ -59,34 +57,47 @@ def _parse_ratio(value: str) -> Optional[float]:
         return None
 
 
+def _parse_csv_date(text: str) -> dt.date:
+    """Parse Cboe's ``M/D/YYYY`` dates without going through ``strptime``."""
+
+    month, day, year = text.split("/")
+    if len(year) != 4:
+        raise ValueError(f"unexpected year in {text!r}")
+    return dt.date(int(year), int(month), int(day))
+
+
 def _latest_csv_row(content: str) -> Tuple[str, float]:
-    reader = csv.reader(io.StringIO(content))
-    latest_date: Optional[dt.date] = None
-    latest_ratio: Optional[float] = None
-    for row in reader:
+    """Return the newest ``(date, ratio)`` row of a Cboe put/call CSV.
+
+    The archives are appended in chronological order, so rows are scanned from
+    the end and the first valid one wins. Reaching the ``DATE`` header means
+    the data section held no usable rows.
+    """
+
+    rows = list(csv.reader(content.splitlines()))
+    for row in reversed(rows):
         if not row:
             continue
-        header = row[0].strip().upper()
-        if header == "DATE":
-            # reset accumulation for the data section
-            latest_date = None
-            latest_ratio = None
-            continue
-        if not row[0].strip():
+        first = row[0].strip()
+        if not first[:1].isdigit():
+            if first.upper() == "DATE":
+                break
             continue
         try:
-            parsed_date = dt.datetime.strptime(row[0].strip(), "%m/%d/%Y").date()
+            parsed_date = _parse_csv_date(first)
         except ValueError:
             continue
         ratio = _parse_ratio(row[-1])
         if ratio is None:
             continue
-        if latest_date is None or parsed_date > latest_date:
-            latest_date = parsed_date
-            latest_ratio = ratio
-    if latest_date is None or latest_ratio is None:
-        raise RuntimeError("CSV 缺少有效的日期或比值")
-    return latest_date.isoformat(), latest_ratio
+        return parsed_date.isoformat(), ratio
+    raise RuntimeError("CSV 缺少有效的日期或比值")
+
+
+def _fetch_csv(session: requests.Session, url: str) -> Tuple[str, float]:
+    resp = session.get(url, timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    return _latest_csv_row(resp.text)
 
 
 def _fetch_csv_ratios(
@@ -95,15 +106,20 @@ def _fetch_csv_ratios(
     ratios: Dict[str, float] = {}
     dates: List[str] = []
     errors: List[str] = []
-    for key, url in CSV_SOURCES.items():
-        try:
-            resp = session.get(url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            date_str, ratio = _latest_csv_row(resp.text)
-            ratios[key] = ratio
-            dates.append(date_str)
-        except Exception as exc:  # noqa: BLE001
-            errors.append(f"{key}: {exc}")
+    # The CSV downloads are independent, so overlap them; results are still
+    # collected in CSV_SOURCES order.
+    with ThreadPoolExecutor(max_workers=len(CSV_SOURCES)) as executor:
+        futures = {
+            key: executor.submit(_fetch_csv, session, url)
+            for key, url in CSV_SOURCES.items()
+        }
+        for key, future in futures.items():
+            try:
+                date_str, ratio = future.result()
+                ratios[key] = ratio
+                dates.append(date_str)
+            except Exception as exc:  # noqa: BLE001
+                errors.append(f"{key}: {exc}")
     unique_dates = sorted(set(dates), reverse=True)
     return ratios, (unique_dates[0] if unique_dates else None), errors
 
@@ -10,17 +10,22 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import io
 import json
 import logging
 import os
 import random
 import re
 import sys
+import threading
 import time
-from collections import deque
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
 from html.parser import HTMLParser
 from pathlib import Path
 from typing import (
@@ -28,6 +33,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -39,9 +45,10 @@ from urllib.parse import quote
 from xml.etree import ElementTree as ET
 
 import requests
+from requests.adapters import HTTPAdapter
 from zoneinfo import ZoneInfo
 
-from daily_messenger.common import run_meta
+from daily_messenger.common import jsonio, run_meta
 from daily_messenger.common.logging import log, setup_logger
 
 if __package__:
@@ -81,6 +88,8 @@ FMP_THEME_SYMBOLS = {
 }
 
 MAX_EVENT_ITEMS = 12
+RSS_ITEMS_PER_FEED = 5
+RSS_MAX_WORKERS = 8
 
 TE_GUEST_CREDENTIAL = "guest:guest"
 
@@ -137,11 +146,24 @@ class _AiNewsSettings:
     timeout: float
     extra_instructions: str = ""
     thinking: Optional[str] = None
+    prompt_suffix: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Resolved once so every market prompt reuses the same suffix.
+        extra = self.extra_instructions.strip()
+        self.prompt_suffix = f"\n{extra}" if extra else ""
 
 
 DEFAULT_GEMINI_MODEL = "gemini-2.5-pro"
 DEFAULT_GEMINI_TIMEOUT = 45.0
 DEFAULT_GEMINI_ENABLE_NETWORK = True
+GEMINI_KEY_FIELD_PREFIXES = ("gemini", "google_gemini")
+GLM_KEY_FIELD_PREFIXES = ("glm", "zhipu", "zhipuai", "zai", "bigmodel")
+# Provider-prefixed fields ending in these are settings, not API keys.
+AI_NEWS_SETTING_FIELD_SUFFIXES = ("model", "enable_network", "extra_prompt", "thinking")
+# Providers whose grounded replies are long enough to cover every market in a
+# single request; the rest are prompted per market.
+AI_NEWS_BATCH_PROVIDERS = frozenset({AI_NEWS_PROVIDER_GEMINI})
 AI_NEWS_PROVIDER_META = {
     AI_NEWS_PROVIDER_GLM: {"source": "glm", "provider": "zhipu_glm"},
     AI_NEWS_PROVIDER_GEMINI: {"source": "gemini", "provider": "google_gemini"},
@@ -153,11 +175,19 @@ GLM_BACKOFF_FACTOR = 2.0
 GLM_BACKOFF_JITTER = 0.35
 
 NEWS_TAG_PATTERN = re.compile(r"<news>(.*?)</news>", re.IGNORECASE | re.DOTALL)
+MARKET_NEWS_TAG_PATTERN = re.compile(
+    r"<news\s[^>]*?market\s*=\s*[\"']?([A-Za-z]+)[\"']?[^>]*>(.*?)</news>",
+    re.IGNORECASE | re.DOTALL,
+)
 GEMINI_MAX_RETRIES = 3
 GEMINI_BACKOFF_START = 0.8
 GEMINI_BACKOFF_FACTOR = 2.0
 GEMINI_BACKOFF_JITTER = 0.35
 GEMINI_INTER_MARKET_DELAY_RANGE = (0.8, 1.6)
+GEMINI_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Content-Type": "application/json",
+}
 
 AI_NEWS_MARKET_SPECS: Tuple[_MarketNewsSpec, ...] = (
     _MarketNewsSpec(
@@ -209,32 +239,20 @@ def _sleep(seconds: float) -> None:
     time.sleep(seconds)
 
 
+# Days to step back from each weekday (Mon=0) to reach a weekday.
+_BACKOFF_DAYS = (0, 0, 0, 0, 0, 1, 2)
+
+
 def _business_day_on_or_before(day: datetime) -> datetime:
-    candidate = day
-    while candidate.weekday() >= 5:
-        candidate -= timedelta(days=1)
-    return candidate
+    backoff = _BACKOFF_DAYS[day.weekday()]
+    return day - timedelta(days=backoff) if backoff else day
 
 
 def _resolve_market_trading_date(now_utc: datetime, spec: _MarketNewsSpec) -> datetime:
     local_now = now_utc.astimezone(spec.timezone)
-    candidate = datetime(
-        local_now.year,
-        local_now.month,
-        local_now.day,
-        0,
-        0,
-        0,
-        tzinfo=spec.timezone,
-    )
-    close_dt = datetime(
-        local_now.year,
-        local_now.month,
-        local_now.day,
-        spec.close_hour,
-        spec.close_minute,
-        0,
-        tzinfo=spec.timezone,
+    candidate = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
+    close_dt = local_now.replace(
+        hour=spec.close_hour, minute=spec.close_minute, second=0, microsecond=0
     )
     if local_now < close_dt:
         candidate -= timedelta(days=1)
@@ -284,6 +302,7 @@ CANONICAL_API_KEYS = (
     "alpaca_key_id",
     "alpaca_secret",
 )
+CANONICAL_API_KEY_SET = frozenset(CANONICAL_API_KEYS)
 
 
 class ApiKeyValidationError(Exception):
@@ -293,31 +312,34 @@ class ApiKeyValidationError(Exception):
 
 
 def _normalize_api_keys(payload: Dict[str, Any]) -> Dict[str, str]:
-    errors: Dict[str, str] = {}
-    normalized: Dict[str, str] = {}
-    extras: Dict[str, Any] = {}
-    canonical = set(CANONICAL_API_KEYS)
-    for key, value in payload.items():
-        if key in canonical:
-            if value is None:
-                continue
-            if not isinstance(value, str):
-                errors[key] = "expected string value"
-                continue
-            stripped = value.strip()
-            if not stripped:
-                errors[key] = "empty string"
-                continue
-            normalized[key] = stripped
-        else:
-            extras[key] = value
+    canonical = {
+        key: value
+        for key, value in payload.items()
+        if key in CANONICAL_API_KEY_SET and value is not None
+    }
+    errors = {
+        key: "expected string value" if not isinstance(value, str) else "empty string"
+        for key, value in canonical.items()
+        if not isinstance(value, str) or not value.strip()
+    }
     if errors:
         raise ApiKeyValidationError(errors)
-    result: Dict[str, Any] = dict(normalized)
-    result.update(extras)
+    result: Dict[str, Any] = {key: value.strip() for key, value in canonical.items()}
+    result.update(
+        (key, value)
+        for key, value in payload.items()
+        if key not in CANONICAL_API_KEY_SET
+    )
     return result
 
 
+@lru_cache(maxsize=4)
+def _read_api_keys_file(path: str, mtime_ns: int) -> Any:
+    # Keyed on mtime so the import-time preload and the run() reload share one
+    # parse, while an edited file is still picked up.
+    return jsonio.load_file(Path(path))
+
+
 def _load_api_keys(logger: logging.Logger | None) -> Dict[str, str]:
     data: Dict[str, Any] = {}
 
@@ -331,8 +353,9 @@ def _load_api_keys(logger: logging.Logger | None) -> Dict[str, str]:
             candidate_paths.append((PROJECT_ROOT / expanded).resolve())
         for candidate in candidate_paths:
             try:
-                with open(candidate, "r", encoding="utf-8") as fh:
-                    payload = json.load(fh)
+                payload = _read_api_keys_file(
+                    str(candidate), candidate.stat().st_mtime_ns
+                )
             except FileNotFoundError:
                 continue
             except Exception as exc:  # noqa: BLE001
@@ -366,14 +389,12 @@ def _load_api_keys(logger: logging.Logger | None) -> Dict[str, str]:
             if isinstance(payload, dict):
                 data.update(payload)
 
-    # 3) Loose environment variables (case insensitive)
+    # 3) Loose environment variables (case insensitive), only for keys the
+    # file and inline payload left unset.
     env = os.environ
-    for key in CANONICAL_API_KEYS:
-        if key in data:
-            continue
-        direct = env.get(key)
-        if not direct:
-            direct = env.get(key.upper())
+    env_get = env.get
+    for key in [key for key in CANONICAL_API_KEYS if key not in data]:
+        direct = env_get(key) or env_get(key.upper())
         if direct:
             data[key] = direct
 
@@ -402,7 +423,7 @@ def _load_api_keys(logger: logging.Logger | None) -> Dict[str, str]:
                 )
         normalized = {k: v for k, v in data.items() if isinstance(v, str) and v.strip()}
 
-    extra_keys = sorted(set(normalized) - set(CANONICAL_API_KEYS))
+    extra_keys = sorted(set(normalized) - CANONICAL_API_KEY_SET)
     if extra_keys:
         if logger:
             log(logger, logging.INFO, "api_key_extra_entries", keys=extra_keys)
@@ -683,27 +704,22 @@ def _collect_ai_news_keys(
         if isinstance(single_candidate, str):
             _push(single_candidate, "primary")
 
-    # Allow arbitrary extra fields to serve as keys when prefixed with gemini
-    for field, value in config.items():
-        if not isinstance(field, str):
-            continue
-        lowered = field.lower()
-        relevant_prefixes = (
-            ("gemini", "google_gemini")
-            if provider == AI_NEWS_PROVIDER_GEMINI
-            else ("glm", "zhipu", "zhipuai", "zai", "bigmodel")
-        )
-        if not any(lowered.startswith(prefix) for prefix in relevant_prefixes):
-            continue
-        if lowered.endswith("_model") or lowered.endswith("model"):
-            continue
-        if lowered.endswith("enable_network"):
+    # Allow arbitrary extra fields to serve as keys when prefixed with the
+    # provider name; str.startswith/endswith take the whole tuple in one call.
+    relevant_prefixes = (
+        GEMINI_KEY_FIELD_PREFIXES
+        if provider == AI_NEWS_PROVIDER_GEMINI
+        else GLM_KEY_FIELD_PREFIXES
+    )
+    for name, value in config.items():
+        if not isinstance(name, str):
             continue
-        if lowered.endswith("extra_prompt"):
+        lowered = name.lower()
+        if not lowered.startswith(relevant_prefixes):
             continue
-        if lowered.endswith("thinking"):
+        if lowered.endswith(AI_NEWS_SETTING_FIELD_SUFFIXES):
             continue
-        _push(value, field)
+        _push(value, name)
 
     return keys
 
@@ -759,18 +775,18 @@ def _resolve_ai_news_settings(api_keys: Dict[str, Any]) -> Optional[_AiNewsSetti
     def _collect_top_level_keys(provider: str) -> List[Tuple[str, str]]:
         raw_keys: List[Tuple[str, str]] = []
         prefixes = (
-            ("gemini", "google_gemini")
+            GEMINI_KEY_FIELD_PREFIXES
             if provider == AI_NEWS_PROVIDER_GEMINI
-            else ("glm", "zhipu", "zhipuai", "zai", "bigmodel")
+            else GLM_KEY_FIELD_PREFIXES
         )
-        for field, value in api_keys.items():
-            if not isinstance(field, str) or not isinstance(value, str):
+        for name, value in api_keys.items():
+            if not isinstance(name, str) or not isinstance(value, str):
                 continue
-            lowered = field.lower()
-            if any(lowered.startswith(prefix) for prefix in prefixes):
+            lowered = name.lower()
+            if lowered.startswith(prefixes):
                 token = value.strip()
                 if token:
-                    raw_keys.append((field, token))
+                    raw_keys.append((name, token))
         return raw_keys
 
     def _choose_provider(section_dict: Optional[Dict[str, Any]]) -> str:
@@ -982,10 +998,6 @@ def _call_gemini_generate_content(
     }
     if enable_network:
         body["tools"] = [{"googleSearchRetrieval": {}}]
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Content-Type": "application/json",
-    }
     per_request_timeout = max(timeout, 5.0)
     hard_deadline = max(per_request_timeout * 2.5, per_request_timeout + 10.0)
     policy = RetryPolicy(
@@ -1002,7 +1014,7 @@ def _call_gemini_generate_content(
         method="POST",
         params=params,
         json_body=body,
-        headers=headers,
+        headers=GEMINI_HEADERS,
         policy=policy,
     )
     if not isinstance(payload, dict):
@@ -1117,37 +1129,227 @@ def _extract_glm_text(payload: Dict[str, Any]) -> str:
 def _extract_news_section(text: str) -> str:
     if not text:
         return ""
-    sections = [match.strip() for match in NEWS_TAG_PATTERN.findall(text) if match]
-    if sections:
-        combined = "\n".join(section.strip() for section in sections if section.strip())
-        return combined.strip()
+    matched = False
+    sections: List[str] = []
+    for match in NEWS_TAG_PATTERN.finditer(text):
+        body = match.group(1)
+        if not body:
+            continue
+        matched = True
+        body = body.strip()
+        if body:
+            sections.append(body)
+    if matched:
+        return "\n".join(sections)
     # Fallback: strip any outer tags and return trimmed text
     return text.strip()
 
 
+MARKET_PROMPT_TEMPLATE = (
+    "今天的日期是北京时间 {now_cn}。"
+    "请联网搜索并总结 {target_cn}（交易日 {target_iso}）{scope}的主要资讯。"
+    "重点包括：核心指数或价格的收盘表现与涨跌幅、盘面主题或板块亮点、以及可能影响市场的重大公司事件或宏观新闻。"
+    "如果查询结果显示该日期尚未结束或被视为未来时间，请自动回退到最近一个已经结束的交易日，并在摘要开头注明实际覆盖的日期与原因。"
+    "输出需要使用中文、保持客观中性语气。"
+    "请将完整内容放在单个 <news> 标签中，标签内使用 Markdown 列出 3-5 条重点，每条最好附带来源或链接。"
+    "除 <news>...</news> 外不要输出其它文本。"
+    "{extra}"
+)
+
+BATCH_PROMPT_TEMPLATE = (
+    "今天的日期是北京时间 {now_cn}。"
+    "请联网搜索并分别总结以下市场在对应交易日的主要资讯：\n"
+    "{markets}"
+    "每个市场重点包括：核心指数或价格的收盘表现与涨跌幅、盘面主题或板块亮点、以及可能影响市场的重大公司事件或宏观新闻。"
+    "如果查询结果显示某个日期尚未结束或被视为未来时间，请自动回退到该市场最近一个已经结束的交易日，并在该市场摘要开头注明实际覆盖的日期与原因。"
+    "输出需要使用中文、保持客观中性语气。"
+    '每个市场的内容放在单独的 <news market="代码"> 标签中（代码取上面列出的 market 值），标签内使用 Markdown 列出 3-5 条重点，每条最好附带来源或链接。'
+    "除这些 <news> 标签外不要输出其它文本。"
+    "{extra}"
+)
+BATCH_MARKET_LINE_TEMPLATE = '- market="{market}"：{target_cn}（交易日 {target_iso}）{scope}\n'
+
+
 def _build_market_prompt(
     spec: _MarketNewsSpec,
     target_day: datetime,
     now_beijing: datetime,
     settings: _AiNewsSettings,
 ) -> str:
-    target_iso = target_day.date().isoformat()
-    target_cn = _format_cn_date(target_day.date())
-    now_cn = now_beijing.strftime("%Y年%m月%d日 %H:%M")
-    extra = (
-        f"\n{settings.extra_instructions.strip()}"
-        if settings.extra_instructions
-        else ""
+    return MARKET_PROMPT_TEMPLATE.format(
+        now_cn=now_beijing.strftime("%Y年%m月%d日 %H:%M"),
+        target_cn=_format_cn_date(target_day.date()),
+        target_iso=target_day.date().isoformat(),
+        scope=spec.scope,
+        extra=settings.prompt_suffix,
     )
-    return (
-        f"今天的日期是北京时间 {now_cn}。"
-        f"请联网搜索并总结 {target_cn}（交易日 {target_iso}）{spec.scope}的主要资讯。"
-        "重点包括：核心指数或价格的收盘表现与涨跌幅、盘面主题或板块亮点、以及可能影响市场的重大公司事件或宏观新闻。"
-        "如果查询结果显示该日期尚未结束或被视为未来时间，请自动回退到最近一个已经结束的交易日，并在摘要开头注明实际覆盖的日期与原因。"
-        "输出需要使用中文、保持客观中性语气。"
-        "请将完整内容放在单个 <news> 标签中，标签内使用 Markdown 列出 3-5 条重点，每条最好附带来源或链接。"
-        "除 <news>...</news> 外不要输出其它文本。"
-        f"{extra}"
+
+
+def _build_batch_market_prompt(
+    specs: Sequence[_MarketNewsSpec],
+    target_days: Mapping[str, datetime],
+    now_beijing: datetime,
+    settings: _AiNewsSettings,
+) -> str:
+    market_lines = "".join(
+        BATCH_MARKET_LINE_TEMPLATE.format(
+            market=spec.market,
+            target_cn=_format_cn_date(target_days[spec.market].date()),
+            target_iso=target_days[spec.market].date().isoformat(),
+            scope=spec.scope,
+        )
+        for spec in specs
+    )
+    return BATCH_PROMPT_TEMPLATE.format(
+        now_cn=now_beijing.strftime("%Y年%m月%d日 %H:%M"),
+        markets=market_lines,
+        extra=settings.prompt_suffix,
+    )
+
+
+def _extract_market_sections(text: str) -> Dict[str, str]:
+    sections: Dict[str, str] = {}
+    for match in MARKET_NEWS_TAG_PATTERN.finditer(text):
+        body = match.group(2).strip()
+        if body:
+            sections.setdefault(match.group(1).lower(), body)
+    return sections
+
+
+# Response fragments that mark a key as unusable for the rest of the run:
+# Gemini invalid key or daily/billing quota, GLM "insufficient balance".
+# Per-minute quota 429s also mention "quota" but clear on their own, so the
+# bare word is deliberately not a marker.
+_DEAD_KEY_MARKERS = (
+    "api_key_invalid",
+    "余额不足",
+    "perday",
+    "per day",
+    "daily",
+    "billing",
+)
+
+
+def _is_dead_key_error(exc: BaseException) -> bool:
+    """Return True only for definite auth or quota failures.
+
+    Retryable statuses surface from ``_request_json`` as ``HTTPError``; other
+    4xx are wrapped in ``RuntimeError`` with the ``HTTPError`` as cause.
+    Transient failures (timeouts, 5xx, per-minute rate limits) keep the key
+    live.
+    """
+
+    error = exc if isinstance(exc, requests.HTTPError) else exc.__cause__
+    response = getattr(error, "response", None)
+    if not isinstance(error, requests.HTTPError) or response is None:
+        return False
+    status = response.status_code
+    if status in (401, 403):
+        return True
+    if status not in (400, 429):
+        return False
+    body = (getattr(response, "text", "") or "").lower()
+    return any(marker in body for marker in _DEAD_KEY_MARKERS)
+
+
+def _request_ai_text(
+    settings: _AiNewsSettings,
+    prompt: str,
+    keys: Sequence[Tuple[str, str]],
+    cursor: int,
+    dead_keys: bytearray,
+) -> Tuple[str, List[str], bool]:
+    """Try each live key from ``cursor`` until one returns non-empty text.
+
+    Returns the text (empty on failure), the per-key error messages and
+    whether any key was actually tried.
+    """
+
+    key_count = len(keys)
+    error_messages: List[str] = []
+    attempted = False
+    for step in range(key_count):
+        index = (cursor + step) % key_count
+        if dead_keys[index]:
+            continue
+        attempted = True
+        label, token = keys[index]
+        try:
+            if settings.provider == AI_NEWS_PROVIDER_GLM:
+                payload = _call_glm_chat_completions(
+                    settings.model,
+                    token,
+                    prompt,
+                    settings.enable_network,
+                    settings.timeout,
+                    settings.thinking,
+                )
+                text = _extract_glm_text(payload)
+            else:
+                payload = _call_gemini_generate_content(
+                    settings.model,
+                    token,
+                    prompt,
+                    settings.enable_network,
+                    settings.timeout,
+                )
+                text = _extract_gemini_text(payload)
+        except requests.HTTPError as exc:
+            error_messages.append(f"{label}: HTTP {exc}")
+            if _is_dead_key_error(exc):
+                dead_keys[index] = 1
+            continue
+        except Exception as exc:  # noqa: BLE001
+            error_messages.append(f"{label}: {exc}")
+            if _is_dead_key_error(exc):
+                dead_keys[index] = 1
+            continue
+
+        if not text:
+            error_messages.append(f"{label}: 空响应")
+            continue
+
+        return text, error_messages, attempted
+    return "", error_messages, attempted
+
+
+def _market_news_result(
+    spec: _MarketNewsSpec,
+    target_day: datetime,
+    beijing_now: datetime,
+    news_section: str,
+    settings: _AiNewsSettings,
+    provider_meta: Dict[str, str],
+) -> Tuple[Optional[Dict[str, Any]], FetchStatus]:
+    name = f"ai_news_{spec.market}"
+    if not news_section:
+        return None, FetchStatus(
+            name=name,
+            ok=False,
+            message=f"{spec.label} 响应缺少 <news> 内容",
+        )
+
+    summary_lines = [
+        line.rstrip() for line in news_section.splitlines() if line.strip()
+    ]
+    summary = "\n".join(summary_lines)
+    update = {
+        "title": f"{spec.label} {target_day.date().isoformat()} 交易日资讯",
+        "market": spec.market,
+        "date": target_day.date().isoformat(),
+        "summary": summary,
+        "source": provider_meta["source"],
+        "provider": provider_meta["provider"],
+        "model": settings.model,
+        "prompt_scope": spec.scope,
+        "prompt_date": target_day.date().isoformat(),
+        "requested_beijing": beijing_now.isoformat(),
+        "raw_text": news_section,
+    }
+    return update, FetchStatus(
+        name=name,
+        ok=True,
+        message=f"{spec.label} 摘要生成成功",
     )
 
 
@@ -1189,119 +1391,75 @@ def _fetch_ai_market_news(
             ],
         )
 
-    key_queue: deque[Tuple[str, str]] = deque(settings.keys)
-    if len(key_queue) > 1:
-        key_queue.rotate(-random.randint(0, len(key_queue) - 1))
+    keys = tuple(settings.keys)
+    key_cursor = random.randrange(len(keys))
+    # Keys rejected for auth or quota are flagged here so later markets skip
+    # them instead of burning a request on each; transient errors do not.
+    dead_keys = bytearray(len(keys))
     beijing_now = now_utc.astimezone(CHINA_TZ)
+    specs = AI_NEWS_MARKET_SPECS
+    target_days = {
+        spec.market: _resolve_market_trading_date(now_utc, spec) for spec in specs
+    }
 
-    for index, spec in enumerate(AI_NEWS_MARKET_SPECS):
-        if index > 0 and not THROTTLE_DISABLED:
-            lower, upper = GEMINI_INTER_MARKET_DELAY_RANGE
-            delay = random.uniform(lower, upper)
-            _sleep_exact(delay)
-        if not key_queue:
-            statuses.append(
-                FetchStatus(
-                    name=f"ai_news_{spec.market}",
-                    ok=False,
-                    message=f"{provider_label} API key 已耗尽",
+    results: Dict[str, Tuple[Optional[Dict[str, Any]], FetchStatus]] = {}
+    if settings.provider in AI_NEWS_BATCH_PROVIDERS:
+        # One grounded request for every market; only markets missing from
+        # the reply fall through to individual prompts below.
+        # The batch is only a shortcut, so it tracks key failures separately
+        # and can never leave the per-market fallback without keys to try.
+        prompt = _build_batch_market_prompt(specs, target_days, beijing_now, settings)
+        batch_dead_keys = bytearray(len(keys))
+        text, _, _ = _request_ai_text(
+            settings, prompt, keys, key_cursor, batch_dead_keys
+        )
+        sections = _extract_market_sections(text) if text else {}
+        for spec in specs:
+            section = sections.get(spec.market)
+            if section:
+                results[spec.market] = _market_news_result(
+                    spec,
+                    target_days[spec.market],
+                    beijing_now,
+                    section,
+                    settings,
+                    provider_meta,
                 )
-            )
-            continue
-
-        target_day = _resolve_market_trading_date(now_utc, spec)
-        prompt = _build_market_prompt(spec, target_day, beijing_now, settings)
-
-        response_text = ""
-        error_messages: List[str] = []
 
-        for _ in range(len(key_queue)):
-            label, token = key_queue[0]
-            try:
-                if settings.provider == AI_NEWS_PROVIDER_GLM:
-                    payload = _call_glm_chat_completions(
-                        settings.model,
-                        token,
-                        prompt,
-                        settings.enable_network,
-                        settings.timeout,
-                        settings.thinking,
-                    )
-                    text = _extract_glm_text(payload)
-                else:
-                    payload = _call_gemini_generate_content(
-                        settings.model,
-                        token,
-                        prompt,
-                        settings.enable_network,
-                        settings.timeout,
+    # Each market is an independent, multi-second request; run them on worker
+    # threads so wall time tracks the slowest market instead of the sum.
+    # Starts stay staggered to keep the request rate unchanged.
+    pending = [spec for spec in specs if spec.market not in results]
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = []
+            for index, spec in enumerate(pending):
+                if index > 0 and not THROTTLE_DISABLED:
+                    lower, upper = GEMINI_INTER_MARKET_DELAY_RANGE
+                    _sleep_exact(random.uniform(lower, upper))
+                futures.append(
+                    executor.submit(
+                        _generate_market_news,
+                        spec,
+                        target_days[spec.market],
+                        beijing_now,
+                        settings,
+                        keys,
+                        (key_cursor + index) % len(keys),
+                        dead_keys,
+                        provider_label,
+                        provider_meta,
                     )
-                    text = _extract_gemini_text(payload)
-            except requests.HTTPError as exc:
-                error_messages.append(f"{label}: HTTP {exc}")
-                key_queue.rotate(-1)
-                continue
-            except Exception as exc:  # noqa: BLE001
-                error_messages.append(f"{label}: {exc}")
-                key_queue.rotate(-1)
-                continue
-
-            if not text:
-                error_messages.append(f"{label}: 空响应")
-                key_queue.rotate(-1)
-                continue
-
-            response_text = text
-            key_queue.rotate(-1)
-            break
-
-        if not response_text:
-            detail = "；".join(error_messages[-3:]) if error_messages else "未知错误"
-            statuses.append(
-                FetchStatus(
-                    name=f"ai_news_{spec.market}",
-                    ok=False,
-                    message=f"{spec.label} 摘要生成失败（{detail}）",
                 )
-            )
-            continue
+            for spec, future in zip(pending, futures):
+                results[spec.market] = future.result()
 
-        news_section = _extract_news_section(response_text)
-        if not news_section:
-            statuses.append(
-                FetchStatus(
-                    name=f"ai_news_{spec.market}",
-                    ok=False,
-                    message=f"{spec.label} 响应缺少 <news> 内容",
-                )
-            )
+    for spec in specs:
+        update, status = results[spec.market]
+        statuses.append(status)
+        if update is None:
             continue
-
-        summary_lines = [
-            line.rstrip() for line in news_section.splitlines() if line.strip()
-        ]
-        summary = "\n".join(summary_lines)
-        update = {
-            "title": f"{spec.label} {target_day.date().isoformat()} 交易日资讯",
-            "market": spec.market,
-            "date": target_day.date().isoformat(),
-            "summary": summary,
-            "source": provider_meta["source"],
-            "provider": provider_meta["provider"],
-            "model": settings.model,
-            "prompt_scope": spec.scope,
-            "prompt_date": target_day.date().isoformat(),
-            "requested_beijing": beijing_now.isoformat(),
-            "raw_text": news_section,
-        }
         updates.append(update)
-        statuses.append(
-            FetchStatus(
-                name=f"ai_news_{spec.market}",
-                ok=True,
-                message=f"{spec.label} 摘要生成成功",
-            )
-        )
         if logger:
             log(
                 logger,
@@ -1315,6 +1473,46 @@ def _fetch_ai_market_news(
     return updates, statuses
 
 
+def _generate_market_news(
+    spec: _MarketNewsSpec,
+    target_day: datetime,
+    beijing_now: datetime,
+    settings: _AiNewsSettings,
+    keys: Sequence[Tuple[str, str]],
+    cursor: int,
+    dead_keys: bytearray,
+    provider_label: str,
+    provider_meta: Dict[str, str],
+) -> Tuple[Optional[Dict[str, Any]], FetchStatus]:
+    name = f"ai_news_{spec.market}"
+    prompt = _build_market_prompt(spec, target_day, beijing_now, settings)
+    response_text, error_messages, attempted = _request_ai_text(
+        settings, prompt, keys, cursor, dead_keys
+    )
+
+    if not attempted:
+        return None, FetchStatus(
+            name=name, ok=False, message=f"{provider_label} API key 已耗尽"
+        )
+
+    if not response_text:
+        detail = "；".join(error_messages[-3:]) if error_messages else "未知错误"
+        return None, FetchStatus(
+            name=name,
+            ok=False,
+            message=f"{spec.label} 摘要生成失败（{detail}）",
+        )
+
+    return _market_news_result(
+        spec,
+        target_day,
+        beijing_now,
+        _extract_news_section(response_text),
+        settings,
+        provider_meta,
+    )
+
+
 def _fetch_gemini_market_news(
     now_utc: datetime,
     api_keys: Dict[str, Any],
@@ -1333,15 +1531,33 @@ def _load_configuration(
     return api_keys, ai_feeds, arxiv_params, arxiv_throttle
 
 
-API_KEYS_CACHE: Dict[str, str] = {}
-AI_NEWS_FEEDS: List[str] = list(DEFAULT_AI_FEEDS)
-ARXIV_QUERY_PARAMS: Dict[str, Any] = dict(DEFAULT_ARXIV_PARAMS)
-ARXIV_THROTTLE: float = DEFAULT_ARXIV_THROTTLE
-
-# Preload configuration once at import so module globals reflect runtime hints.
-API_KEYS_CACHE, AI_NEWS_FEEDS, ARXIV_QUERY_PARAMS, ARXIV_THROTTLE = (
-    _load_configuration()
+# Resolved on first attribute access (PEP 562) rather than at import, so merely
+# importing this module does not read the keys file or scan the environment.
+# run() reloads and assigns them explicitly.
+API_KEYS_CACHE: Dict[str, str]
+AI_NEWS_FEEDS: List[str]
+ARXIV_QUERY_PARAMS: Dict[str, Any]
+ARXIV_THROTTLE: float
+_LAZY_CONFIG_NAMES = (
+    "API_KEYS_CACHE",
+    "AI_NEWS_FEEDS",
+    "ARXIV_QUERY_PARAMS",
+    "ARXIV_THROTTLE",
 )
+# Drop values left by a previous import so importlib.reload() re-resolves them.
+for _name in _LAZY_CONFIG_NAMES:
+    globals().pop(_name, None)
+del _name
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_CONFIG_NAMES:
+        global API_KEYS_CACHE, AI_NEWS_FEEDS, ARXIV_QUERY_PARAMS, ARXIV_THROTTLE
+        API_KEYS_CACHE, AI_NEWS_FEEDS, ARXIV_QUERY_PARAMS, ARXIV_THROTTLE = (
+            _load_configuration()
+        )
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _respect_retry_after(resp: requests.Response) -> Optional[float]:
@@ -1384,6 +1600,49 @@ class RetryPolicy:
 RETRY_DEFAULT = RetryPolicy()
 RETRY_EDGAR = RetryPolicy(retries=3, backoff_start=0.6, backoff_factor=2.0, jitter=0.25)
 
+# One pool per provider host; the per-host size matches the AI news worker
+# count so concurrent prompts each keep a warm connection.
+_SESSION_POOL_HOSTS = 16
+_SESSION_POOL_SIZE = 8
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+# Per-run memo of idempotent GET response bodies; only active inside
+# http_session_scope() so separate runs (and tests) never share entries.
+# Raw bytes are stored so every hit decodes a fresh, caller-owned payload.
+_GET_CACHE: Optional[Dict[Tuple[Any, ...], bytes]] = None
+
+
+def _get_session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=_SESSION_POOL_HOSTS,
+                    pool_maxsize=_SESSION_POOL_SIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+@contextmanager
+def http_session_scope() -> Iterator[requests.Session]:
+    """Share one pooled session for the duration of the block, then close it."""
+
+    global _SESSION, _GET_CACHE
+    _GET_CACHE = {}
+    try:
+        yield _get_session()
+    finally:
+        _GET_CACHE = None
+        with _SESSION_LOCK:
+            session, _SESSION = _SESSION, None
+        if session is not None:
+            session.close()
+
 
 def _request_json(
     url: str,
@@ -1397,93 +1656,118 @@ def _request_json(
     after_each_sleep: float = 0.0,
 ) -> Any:
     method = method.upper()
-    own_session = session or requests.Session()
-    close_session = session is None
+    cache = _GET_CACHE
+    cache_key: Optional[Tuple[Any, ...]] = None
+    if cache is not None and method == "GET" and session is None and json_body is None:
+        # Several fetchers hit the same Yahoo/FMP endpoints for one symbol;
+        # answer repeats within the run from memory.
+        try:
+            cache_key = (
+                url,
+                tuple(sorted((params or {}).items())),
+                tuple(sorted((headers or {}).items())),
+            )
+            return jsonio.loads(cache[cache_key])
+        except KeyError:
+            pass
+        except TypeError:  # unhashable or unorderable params
+            cache_key = None
+    own_session = session or _get_session()
     hdrs = {"User-Agent": USER_AGENT}
     if headers:
         hdrs.update(headers)
+    body: Optional[bytes] = None
+    if json_body is not None:
+        # Encode once up front; retries resend the same bytes.
+        body = jsonio.dumps(json_body)
+        hdrs.setdefault("Content-Type", "application/json")
     attempt = 0
     delay = policy.backoff_start
-    start = time.monotonic()
-    try:
-        while True:
-            attempt += 1
-            try:
-                resp = own_session.request(
-                    method,
-                    url,
-                    params=params,
-                    json=json_body,
-                    headers=hdrs,
-                    timeout=policy.per_request_timeout,
-                )
-            except requests.RequestException as exc:
-                if attempt > policy.retries:
-                    raise RuntimeError(
-                        f"HTTP 请求失败（已重试 {attempt - 1} 次）: {exc}"
-                    ) from exc
-                sleep_seconds = min(
-                    delay * (1.0 + random.random() * policy.jitter), policy.max_sleep
-                )
-                if (
-                    policy.hard_deadline
-                    and (time.monotonic() - start + sleep_seconds)
-                    > policy.hard_deadline
-                ):
-                    raise RuntimeError("HTTP 请求失败：超过重试预算") from exc
-                _sleep_exact(sleep_seconds)
-                delay *= policy.backoff_factor
-                continue
-
-            if resp.status_code in policy.status_forcelist:
-                retry_after = (
-                    _respect_retry_after(resp) if resp.status_code == 429 else None
-                )
-                if attempt > policy.retries:
-                    resp.raise_for_status()
-                sleep_seconds = (
-                    retry_after
-                    if retry_after is not None
-                    else min(
-                        delay * (1.0 + random.random() * policy.jitter),
-                        policy.max_sleep,
-                    )
-                )
-                if (
-                    policy.hard_deadline
-                    and (time.monotonic() - start + sleep_seconds)
-                    > policy.hard_deadline
-                ):
-                    resp.raise_for_status()
-                _sleep_exact(sleep_seconds)
-                delay *= policy.backoff_factor
-                continue
-
-            try:
-                resp.raise_for_status()
-            except Exception as exc:  # noqa: BLE001
-                snippet = resp.text[:200] if getattr(resp, "text", None) else str(exc)
+    retries = policy.retries
+    jitter = policy.jitter
+    max_sleep = policy.max_sleep
+    clock_ns = time.perf_counter_ns
+    # Absolute integer deadline, so each retry needs one clock read and no
+    # float arithmetic to check it; only the sleep itself stays a float.
+    deadline_ns = (
+        clock_ns() + int(policy.hard_deadline * 1e9) if policy.hard_deadline else None
+    )
+    while True:
+        attempt += 1
+        try:
+            resp = own_session.request(
+                method,
+                url,
+                params=params,
+                data=body,
+                headers=hdrs,
+                timeout=policy.per_request_timeout,
+            )
+        except requests.RequestException as exc:
+            if attempt > retries:
                 raise RuntimeError(
-                    f"HTTP 状态错误: {resp.status_code} {snippet}"
+                    f"HTTP 请求失败（已重试 {attempt - 1} 次）: {exc}"
                 ) from exc
+            sleep_seconds = min(delay + delay * random.random() * jitter, max_sleep)
+            if (
+                deadline_ns is not None
+                and clock_ns() + int(sleep_seconds * 1e9) > deadline_ns
+            ):
+                raise RuntimeError("HTTP 请求失败：超过重试预算") from exc
+            _sleep_exact(sleep_seconds)
+            delay *= policy.backoff_factor
+            continue
 
-            try:
-                payload = resp.json()
-            except ValueError as exc:
-                if attempt <= policy.retries:
-                    _sleep_exact(min(0.5 * (1 + random.random()), 1.0))
-                    continue
-                raise RuntimeError("响应解析失败（JSON）") from exc
-
-            if after_each_sleep > 0:
-                _sleep_exact(after_each_sleep)
-            return payload
-    finally:
-        if close_session:
-            own_session.close()
+        if resp.status_code in policy.status_forcelist:
+            retry_after = (
+                _respect_retry_after(resp) if resp.status_code == 429 else None
+            )
+            if attempt > retries:
+                resp.raise_for_status()
+            sleep_seconds = (
+                retry_after
+                if retry_after is not None
+                else min(delay + delay * random.random() * jitter, max_sleep)
+            )
+            if (
+                deadline_ns is not None
+                and clock_ns() + int(sleep_seconds * 1e9) > deadline_ns
+            ):
+                resp.raise_for_status()
+            _sleep_exact(sleep_seconds)
+            delay *= policy.backoff_factor
+            continue
+
+        try:
+            resp.raise_for_status()
+        except Exception as exc:  # noqa: BLE001
+            snippet = resp.text[:200] if getattr(resp, "text", None) else str(exc)
+            raise RuntimeError(
+                f"HTTP 状态错误: {resp.status_code} {snippet}"
+            ) from exc
+
+        try:
+            payload = jsonio.loads(resp.content)
+        except ValueError as exc:
+            if attempt <= retries:
+                _sleep_exact(min(0.5 * (1 + random.random()), 1.0))
+                continue
+            raise RuntimeError("响应解析失败（JSON）") from exc
+
+        if after_each_sleep > 0:
+            _sleep_exact(after_each_sleep)
+        if cache is not None and cache_key is not None:
+            cache[cache_key] = resp.content
+        return payload
 
 
 def _safe_float(value: Any) -> Optional[float]:
+    # JSON payloads mostly hand us floats already; skip the try/except setup.
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
     try:
         return float(value)
     except (TypeError, ValueError):
@@ -1495,8 +1779,8 @@ def _coerce_api_key(value: Any) -> Optional[str]:
         token = value.strip()
         return token or None
     if isinstance(value, dict):
-        for field in ("api_key", "key", "token", "secret"):
-            candidate = value.get(field)
+        for name in ("api_key", "key", "token", "secret"):
+            candidate = value.get(name)
             if isinstance(candidate, str):
                 token = candidate.strip()
                 if token:
@@ -1516,43 +1800,109 @@ def _yahoo_allowed() -> bool:
     return _env_truthy(os.getenv("YFINANCE_FALLBACK"))
 
 
-def _rss_text(node: ET.Element, *paths: str) -> str:
-    for path in paths:
-        text = node.findtext(path)
-        if text:
-            return text.strip()
+def _local_children(node: ET.Element) -> Dict[str, ET.Element]:
+    """Map each direct child's local tag name to its first element.
+
+    Namespaces are dropped, so ``dc:date`` or an Atom-namespaced ``title``
+    inside a plain RSS item match like unqualified tags, in one pass over
+    the children instead of a ``{*}`` wildcard search per field.
+    """
+
+    children: Dict[str, ET.Element] = {}
+    for child in node:
+        children.setdefault(child.tag.rsplit("}", 1)[-1], child)
+    return children
+
+
+def _rss_text(children: Mapping[str, ET.Element], *names: str) -> str:
+    for name in names:
+        child = children.get(name)
+        if child is not None and child.text:
+            return child.text.strip()
     return ""
 
 
+def _iter_feed_nodes(content: bytes) -> Iterator[ET.Element]:
+    """Yield RSS ``<item>`` and Atom ``<entry>`` elements as they close.
+
+    Each element is cleared once the consumer moves on, so memory stays
+    bounded by a single entry rather than the whole feed.
+    """
+
+    for _, elem in ET.iterparse(io.BytesIO(content), events=("end",)):
+        tag = elem.tag
+        if tag == "item" or tag == "entry" or tag.endswith("}entry"):
+            yield elem
+            elem.clear()
+
+
+def _rss_item_event(item: ET.Element, url: str, fallback_date: str) -> Dict[str, Any]:
+    children = _local_children(item)
+    title = _rss_text(children, "title") or "更新"
+    date_text = _rss_text(
+        children, "pubDate", "updated", "published", "date", "lastBuildDate"
+    )
+    normalized_date = _normalize_rss_date(date_text) or fallback_date
+    link_url = ""
+    link_node = children.get("link")
+    if link_node is not None:
+        # RSS carries the URL as element text; Atom in the href attribute.
+        link_url = (link_node.text or "").strip() or (link_node.get("href") or "").strip()
+    return {
+        "title": title,
+        "date": normalized_date,
+        "impact": "medium",
+        "source": url,
+        "url": link_url,
+    }
+
+
+@lru_cache(maxsize=4096)
 def _normalize_rss_date(raw: str) -> Optional[str]:
     if not raw:
         return None
     text = raw.strip()
     if not text:
         return None
+    # Atom/arXiv timestamps are ISO 8601 ("2024-04-01T08:00:00Z"); parse those
+    # directly rather than letting the RFC 2822 parser fail on them first.
+    if text[4:5] == "-":
+        try:
+            return datetime.fromisoformat(text).date().isoformat()
+        except ValueError:
+            pass
     try:
         parsed = parsedate_to_datetime(text)
     except Exception:  # noqa: BLE001
-        parsed = None
+        return None
     if parsed is None:
-        try:
-            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
-        except ValueError:
-            return None
+        return None
     return parsed.date().isoformat()
 
 
+def _download_feed(url: str) -> bytes:
+    resp = _get_session().get(
+        url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT
+    )
+    resp.raise_for_status()
+    return resp.content
+
+
 def _fetch_ai_rss_events(
     feeds: List[str],
 ) -> Tuple[List[Dict[str, Any]], List[FetchStatus]]:
     events: List[Dict[str, Any]] = []
     statuses: List[FetchStatus] = []
-    for idx, url in enumerate(feeds, start=1):
+    if not feeds:
+        return events, statuses
+    # Undated items fall back to today's UTC date, resolved once per call.
+    today = datetime.now(timezone.utc).date().isoformat()
+    # Downloads overlap on worker threads; parsing stays here, in feed order.
+    with ThreadPoolExecutor(max_workers=min(RSS_MAX_WORKERS, len(feeds))) as executor:
+        futures = [executor.submit(_download_feed, url) for url in feeds]
+    for idx, (url, future) in enumerate(zip(feeds, futures), start=1):
         try:
-            resp = requests.get(
-                url, headers={"User-Agent": USER_AGENT}, timeout=REQUEST_TIMEOUT
-            )
-            resp.raise_for_status()
+            content = future.result()
         except Exception as exc:  # noqa: BLE001
             statuses.append(
                 FetchStatus(
@@ -1562,8 +1912,20 @@ def _fetch_ai_rss_events(
                 )
             )
             continue
+        # Stream the feed and stop after the first few items instead of
+        # materialising the whole document tree.
+        feed_events: List[Dict[str, Any]] = []
+        atom_events: List[Dict[str, Any]] = []
         try:
-            root = ET.fromstring(resp.content)
+            for node in _iter_feed_nodes(content):
+                if node.tag == "item":
+                    feed_events.append(_rss_item_event(node, url, today))
+                    if len(feed_events) >= RSS_ITEMS_PER_FEED:
+                        break
+                elif not feed_events:
+                    atom_events.append(_rss_item_event(node, url, today))
+                    if len(atom_events) >= RSS_ITEMS_PER_FEED:
+                        break
         except ET.ParseError as exc:
             statuses.append(
                 FetchStatus(
@@ -1573,39 +1935,8 @@ def _fetch_ai_rss_events(
                 )
             )
             continue
-
-        items = root.findall(".//item") or root.findall(".//{*}entry")
-        feed_events: List[Dict[str, Any]] = []
-        for item in items[:5]:
-            title = _rss_text(item, "title", "{*}title") or "更新"
-            date_text = _rss_text(
-                item,
-                "pubDate",
-                "{*}updated",
-                "{*}published",
-                "{*}lastBuildDate",
-            )
-            normalized_date = _normalize_rss_date(date_text)
-            if not normalized_date:
-                normalized_date = datetime.utcnow().strftime("%Y-%m-%d")
-            link_url = _rss_text(item, "link", "{*}link")
-            if not link_url:
-                link_node = item.find("link") or item.find("{*}link")
-                if link_node is not None:
-                    href = link_node.get("href")
-                    if href:
-                        link_url = href.strip()
-                    elif link_node.text:
-                        link_url = link_node.text.strip()
-            feed_events.append(
-                {
-                    "title": title,
-                    "date": normalized_date,
-                    "impact": "medium",
-                    "source": url,
-                    "url": link_url or "",
-                }
-            )
+        if not feed_events:
+            feed_events = atom_events
         events.extend(feed_events)
         statuses.append(
             FetchStatus(
@@ -1622,7 +1953,7 @@ def _fetch_arxiv_events(
 ) -> Tuple[List[Dict[str, Any]], FetchStatus]:
     url = "https://export.arxiv.org/api/query"
     try:
-        resp = requests.get(
+        resp = _get_session().get(
             url,
             params=params,
             headers={"User-Agent": USER_AGENT},
@@ -1632,40 +1963,18 @@ def _fetch_arxiv_events(
     except Exception as exc:  # noqa: BLE001
         return [], FetchStatus(name="arxiv", ok=False, message=f"arXiv 请求失败: {exc}")
 
+    events: List[Dict[str, Any]] = []
+    today = datetime.now(timezone.utc).date().isoformat()
     try:
-        root = ET.fromstring(resp.content)
+        for entry in _iter_feed_nodes(resp.content):
+            if entry.tag == "item":
+                continue
+            events.append(_arxiv_entry_event(entry, today))
     except ET.ParseError as exc:
         return [], FetchStatus(
             name="arxiv", ok=False, message=f"arXiv 响应解析失败: {exc}"
         )
 
-    events: List[Dict[str, Any]] = []
-    for entry in root.findall(".//{*}entry"):
-        title = (_rss_text(entry, "{*}title") or "").replace("\n", " ").strip()
-        if not title:
-            title = "arXiv 更新"
-        date_text = _rss_text(entry, "{*}updated", "{*}published")
-        normalized_date = None
-        if date_text:
-            try:
-                normalized_date = (
-                    datetime.fromisoformat(date_text.replace("Z", "+00:00"))
-                    .date()
-                    .isoformat()
-                )
-            except ValueError:
-                normalized_date = _normalize_rss_date(date_text)
-        if not normalized_date:
-            normalized_date = datetime.utcnow().strftime("%Y-%m-%d")
-        events.append(
-            {
-                "title": f"arXiv: {title}",
-                "date": normalized_date,
-                "impact": "low",
-                "source": "arxiv",
-            }
-        )
-
     if throttle > 0:
         _sleep(throttle)
 
@@ -1674,6 +1983,46 @@ def _fetch_arxiv_events(
     )
 
 
+def _arxiv_entry_event(entry: ET.Element, fallback_date: str) -> Dict[str, Any]:
+    children = _local_children(entry)
+    title = (_rss_text(children, "title") or "").replace("\n", " ").strip()
+    if not title:
+        title = "arXiv 更新"
+    date_text = _rss_text(children, "updated", "published")
+    normalized_date = _normalize_rss_date(date_text) or fallback_date
+    return {
+        "title": f"arXiv: {title}",
+        "date": normalized_date,
+        "impact": "low",
+        "source": "arxiv",
+    }
+
+
+_HTML_SKIP_BLOCK_PATTERN = re.compile(
+    r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_HTML_TABLE_OPEN_PATTERN = re.compile(r"<table\b", re.IGNORECASE)
+_HTML_CELL_TAGS = frozenset({"td", "th"})
+
+
+def _table_markup(html: str) -> str:
+    """Trim a page down to its table markup before handing it to HTMLParser.
+
+    The pure-Python parser tokenises everything it is fed, so dropping
+    scripts, styles and the page chrome around the tables saves most of the
+    work on large pages.
+    """
+
+    html = _HTML_SKIP_BLOCK_PATTERN.sub("", html)
+    opening = _HTML_TABLE_OPEN_PATTERN.search(html)
+    if opening is None:
+        return ""
+    closing = max(html.rfind("</table"), html.rfind("</TABLE"))
+    if closing < opening.start():
+        return html[opening.start() :]
+    return html[opening.start() : closing] + "</table>"
+
+
 class _HTMLTableParser(HTMLParser):
     """Extract rows from a simple HTML table."""
 
@@ -1687,12 +2036,12 @@ class _HTMLTableParser(HTMLParser):
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:  # type: ignore[override]
         if tag == "tr":
             self._current = []
-        elif tag in {"td", "th"}:
+        elif tag in _HTML_CELL_TAGS:
             self._capture = True
             self._buffer = []
 
     def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
-        if tag in {"td", "th"} and self._capture:
+        if tag in _HTML_CELL_TAGS and self._capture:
             value = "".join(self._buffer).strip()
             self._current.append(value)
             self._capture = False
@@ -1704,13 +2053,19 @@ class _HTMLTableParser(HTMLParser):
             self._buffer.append(data)
 
 
+# Thousands separators go, the Unicode minus becomes ASCII; one translate pass.
+_NUMBER_TRANSLATION = str.maketrans({",": None, "\u2212": "-"})
+
+
+@lru_cache(maxsize=4096)
 def _parse_number(value: str) -> Optional[float]:
     text = value.strip()
     if not text or text == "-":
         return None
-    negative = text.startswith("(") and text.endswith(")")
-    text = text.strip("() ")
-    normalized = text.replace(",", "").replace("\u2212", "-")
+    negative = text[:1] == "(" and text[-1:] == ")"
+    # Only the accounting parentheses and padding at the ends are stripped;
+    # inner spaces or brackets still make the cell unparseable.
+    normalized = text.strip("() ").translate(_NUMBER_TRANSLATION)
     try:
         number = float(normalized)
     except ValueError:
@@ -1718,21 +2073,46 @@ def _parse_number(value: str) -> Optional[float]:
     return -number if negative else number
 
 
-def _latest_date(rows: Iterable[List[str]]) -> Optional[List[str]]:
-    parsed: List[Tuple[datetime, List[str]]] = []
+_MONTH_ABBREVIATIONS = {
+    name: index
+    for index, name in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(), start=1
+    )
+}
+
+
+def _parse_day_month_year(text: str) -> Optional[date]:
+    """Parse Farside's ``"05 Apr 2024"`` dates without going through strptime."""
+
+    parts = text.split()
+    if len(parts) != 3:
+        return None
+    day_text, month_text, year_text = parts
+    month = _MONTH_ABBREVIATIONS.get(month_text.title())
+    if month is None or not day_text.isdigit() or not year_text.isdigit():
+        return None
+    try:
+        return date(int(year_text), month, int(day_text))
+    except ValueError:
+        return None
+
+
+def _dated_rows(rows: Iterable[List[str]]) -> Iterator[Tuple[date, List[str]]]:
     for row in rows:
         if not row:
             continue
         first = row[0].strip()
-        try:
-            parsed_date = datetime.strptime(first, "%d %b %Y")
-        except ValueError:
+        # Header, total and average rows never start with a day number.
+        if not first[:1].isdigit():
             continue
-        parsed.append((parsed_date, row))
-    if not parsed:
-        return None
-    parsed.sort(key=lambda item: item[0], reverse=True)
-    return parsed[0][1]
+        parsed_date = _parse_day_month_year(first)
+        if parsed_date is not None:
+            yield parsed_date, row
+
+
+def _latest_date(rows: Iterable[List[str]]) -> Optional[List[str]]:
+    latest = max(_dated_rows(rows), key=lambda pair: pair[0], default=None)
+    return latest[1] if latest is not None else None
 
 
 SOSOVALUE_INFLOW_URL = "https://api.sosovalue.xyz/openapi/v2/etf/historicalInflowChart"
@@ -1740,6 +2120,55 @@ COINGLASS_ETF_ENDPOINTS = (
     "https://open-api-v4.coinglass.com/api/bitcoin/etf/flow-history",
     "https://open-api-v1.coinglass.com/api/bitcoin/etf/flow-history",
 )
+# Candidate record fields in provider priority order.
+ETF_FLOW_DAY_KEYS = ("date", "day")
+SOSOVALUE_AMOUNT_KEYS = ("totalNetInflow", "netInflow", "netflow", "netFlow")
+COINGLASS_AMOUNT_KEYS = (
+    "netFlow",
+    "netflow",
+    "net_inflow",
+    "netInflow",
+    "totalNetInflow",
+    "totalNetFlow",
+)
+
+
+def _first_present(record: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Mirror ``record.get(k1) or record.get(k2) or ...`` over *keys*.
+
+    Falsy placeholders (``""``, ``0``) fall through to the next key, and the
+    last key's value is returned when none is truthy.
+    """
+
+    value = None
+    for key in keys:
+        value = record.get(key)
+        if value:
+            return value
+    return value
+
+
+def _flow_points(
+    records: Iterable[Dict[str, Any]], amount_keys: Tuple[str, ...]
+) -> Iterator[Tuple[date, float]]:
+    for item in records:
+        day_value = _first_present(item, ETF_FLOW_DAY_KEYS)
+        amount = _safe_float(_first_present(item, amount_keys))
+        if not day_value or amount is None:
+            continue
+        try:
+            parsed_day = date.fromisoformat(str(day_value)[:10])
+        except ValueError:
+            continue
+        yield parsed_day, amount
+
+
+def _latest_flow(
+    records: Iterable[Dict[str, Any]], amount_keys: Tuple[str, ...]
+) -> Optional[Tuple[date, float]]:
+    """Return the newest ``(day, amount)`` pair; the first record wins ties."""
+
+    return max(_flow_points(records, amount_keys), key=lambda pair: pair[0], default=None)
 
 
 def _fetch_sosovalue_latest_flow(api_key: str) -> Tuple[Optional[float], FetchStatus]:
@@ -1787,42 +2216,20 @@ def _fetch_sosovalue_latest_flow(api_key: str) -> Tuple[Optional[float], FetchSt
         if not records and data:
             records = [data]
 
-    latest_amount: Optional[float] = None
-    latest_day = ""
-    latest_ts: Optional[datetime] = None
-    for item in records:
-        day_value = item.get("date") or item.get("day")
-        amount_value = (
-            item.get("totalNetInflow")
-            or item.get("netInflow")
-            or item.get("netflow")
-            or item.get("netFlow")
-        )
-        amount = _safe_float(amount_value)
-        if not day_value or amount is None:
-            continue
-        day_text = str(day_value)[:10]
-        try:
-            parsed_day = datetime.strptime(day_text, "%Y-%m-%d")
-        except ValueError:
-            continue
-        if latest_ts is None or parsed_day > latest_ts:
-            latest_ts = parsed_day
-            latest_day = parsed_day.strftime("%Y-%m-%d")
-            latest_amount = amount
-
-    if latest_amount is None or not latest_day:
+    latest = _latest_flow(records, SOSOVALUE_AMOUNT_KEYS)
+    if latest is None:
         return None, FetchStatus(
             name="btc_etf_flow_sosovalue",
             ok=False,
             message="SoSoValue 响应缺少有效数据",
         )
 
+    latest_day, latest_amount = latest
     net_musd = latest_amount / 1_000_000.0
     return net_musd, FetchStatus(
         name="btc_etf_flow_sosovalue",
         ok=True,
-        message=f"SoSoValue ETF 净流入已获取（{latest_day}）",
+        message=f"SoSoValue ETF 净流入已获取（{latest_day.isoformat()}）",
     )
 
 
@@ -1861,36 +2268,12 @@ def _fetch_coinglass_latest_flow(api_key: str) -> Tuple[Optional[float], FetchSt
             if not records and data:
                 records = [data]
 
-        latest_amount: Optional[float] = None
-        latest_day = ""
-        latest_ts: Optional[datetime] = None
-        for item in records:
-            day_value = item.get("date") or item.get("day")
-            amount_value = (
-                item.get("netFlow")
-                or item.get("netflow")
-                or item.get("net_inflow")
-                or item.get("netInflow")
-                or item.get("totalNetInflow")
-                or item.get("totalNetFlow")
-            )
-            amount = _safe_float(amount_value)
-            if not day_value or amount is None:
-                continue
-            day_text = str(day_value)[:10]
-            try:
-                parsed_day = datetime.strptime(day_text, "%Y-%m-%d")
-            except ValueError:
-                continue
-            if latest_ts is None or parsed_day > latest_ts:
-                latest_ts = parsed_day
-                latest_day = parsed_day.strftime("%Y-%m-%d")
-                latest_amount = amount
-
-        if latest_amount is None or not latest_day:
+        latest = _latest_flow(records, COINGLASS_AMOUNT_KEYS)
+        if latest is None:
             errors.append(f"{url}: 缺少有效数据")
             continue
 
+        latest_day, latest_amount = latest
         net_amount = (
             latest_amount / 1_000_000.0
             if abs(latest_amount) > 100000
@@ -1899,7 +2282,7 @@ def _fetch_coinglass_latest_flow(api_key: str) -> Tuple[Optional[float], FetchSt
         return net_amount, FetchStatus(
             name="btc_etf_flow_coinglass",
             ok=True,
-            message=f"CoinGlass ETF 净流入已获取（{latest_day}）",
+            message=f"CoinGlass ETF 净流入已获取（{latest_day.isoformat()}）",
         )
 
     detail = "; ".join(errors) if errors else "未知原因"
@@ -1915,7 +2298,7 @@ def _fetch_farside_flow_from_html(session: requests.Session) -> float:
     response = session.get(FARSIDE_PAGE_URL, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     parser = _HTMLTableParser()
-    parser.feed(response.text)
+    parser.feed(_table_markup(response.text))
     latest = _latest_date(parser.rows)
     if not latest:
         raise RuntimeError("未能解析 ETF 流入数据")
@@ -1933,12 +2316,12 @@ def _fetch_farside_flow_from_api(session: requests.Session) -> float:
         timeout=REQUEST_TIMEOUT,
     )
     response.raise_for_status()
-    payload = response.json()
+    payload = jsonio.loads(response.content)
     if not payload:
         raise RuntimeError("Farside 未返回内容")
     content = payload[0].get("content", {}).get("rendered", "")
     parser = _HTMLTableParser()
-    parser.feed(content)
+    parser.feed(_table_markup(content))
     latest = _latest_date(parser.rows)
     if not latest:
         raise RuntimeError("未能解析 ETF 流入数据")
@@ -1985,38 +2368,38 @@ def _fetch_farside_latest_flow() -> Tuple[Optional[float], FetchStatus]:
 def _fetch_btc_etf_flow(
     api_keys: Dict[str, Any],
 ) -> Tuple[Optional[float], FetchStatus]:
-    attempts: List[str] = []
-
+    # Providers in priority order: (fallback failure message, fetcher).
+    providers: List[
+        Tuple[Optional[str], Callable[[], Tuple[Optional[float], FetchStatus]]]
+    ] = []
     sosovalue_key = _coerce_api_key(api_keys.get("sosovalue"))
     if sosovalue_key:
-        amount, status = _fetch_sosovalue_latest_flow(sosovalue_key)
-        if status.ok and amount is not None:
-            message = status.message
-            if attempts:
-                message += f"；此前失败: {', '.join(attempts)}"
-            return amount, FetchStatus(name="btc_etf_flow", ok=True, message=message)
-        attempts.append(status.message or "SoSoValue 获取失败")
-
+        providers.append(
+            ("SoSoValue 获取失败", partial(_fetch_sosovalue_latest_flow, sosovalue_key))
+        )
     coinglass_key = _coerce_api_key(api_keys.get("coinglass"))
     if coinglass_key:
-        amount, status = _fetch_coinglass_latest_flow(coinglass_key)
+        providers.append(
+            ("CoinGlass 获取失败", partial(_fetch_coinglass_latest_flow, coinglass_key))
+        )
+    providers.append((None, _fetch_farside_latest_flow))
+
+    # Try providers one at a time and stop at the first usable figure, so the
+    # common case costs a single request and spends no fallback quota.
+    attempts: List[str] = []
+    for fallback, fetcher in providers:
+        amount, status = fetcher()
         if status.ok and amount is not None:
             message = status.message
             if attempts:
-                message += f"；此前失败: {', '.join(attempts)}"
+                skipped = ", ".join(attempts)
+                message += f"；此前失败: {skipped}" if fallback else f"；已跳过 {skipped}"
             return amount, FetchStatus(name="btc_etf_flow", ok=True, message=message)
-        attempts.append(status.message or "CoinGlass 获取失败")
-
-    amount, status = _fetch_farside_latest_flow()
-    if status.ok and amount is not None:
-        message = status.message
-        if attempts:
-            message += f"；已跳过 {', '.join(attempts)}"
-        return amount, FetchStatus(name="btc_etf_flow", ok=True, message=message)
-
-    if status.message:
-        attempts.append(status.message)
-    detail = "；".join(filter(None, attempts))
+        failure = status.message or fallback
+        if failure:
+            attempts.append(failure)
+
+    detail = "；".join(attempts)
     message = detail or "ETF 净流入获取失败"
     return None, FetchStatus(name="btc_etf_flow", ok=False, message=message)
 
@@ -2155,23 +2538,25 @@ def _stooq_symbol_candidates(symbol: str) -> List[str]:
 
 def _fetch_stooq_series(symbol: str) -> List[Dict[str, Any]]:
     params = {"s": symbol.lower(), "i": "d"}
-    resp = requests.get(
+    resp = _get_session().get(
         "https://stooq.com/q/d/l/",
         params=params,
         headers={"User-Agent": USER_AGENT},
         timeout=REQUEST_TIMEOUT,
     )
     resp.raise_for_status()
-    reader = csv.DictReader(resp.text.splitlines())
+    reader = csv.reader(resp.text.splitlines())
+    header = [name.strip().lower() for name in next(reader, [])]
     rows: List[Dict[str, Any]] = []
-    for row in reader:
-        normalized = {
-            k.strip().lower(): (v.strip() if isinstance(v, str) else v)
-            for k, v in row.items()
-            if k
-        }
-        if normalized.get("date"):
-            rows.append(normalized)
+    if "date" in header:
+        date_idx = header.index("date")
+        # One dict per kept row, built straight from the positional cells;
+        # rows without a date are dropped before anything is allocated.
+        rows = [
+            dict(zip(header, map(str.strip, row)))
+            for row in reader
+            if len(row) > date_idx and row[date_idx].strip()
+        ]
     if len(rows) < 2:
         raise RuntimeError("Stooq 未返回足够的时间序列")
     return rows
@@ -2180,8 +2565,9 @@ def _fetch_stooq_series(symbol: str) -> List[Dict[str, Any]]:
 def _extract_latest_change(
     rows: List[Dict[str, Any]], *, close_key: str = "close"
 ) -> Tuple[str, float, float]:
-    ordered = sorted(rows, key=lambda item: item.get("date"))
-    latest, prev = ordered[-1], ordered[-2]
+    # nlargest over the reversed rows keeps sorted()[-1] tie-breaking (the
+    # later row wins) without ordering the whole multi-year series.
+    latest, prev = heapq.nlargest(2, reversed(rows), key=lambda item: item.get("date"))
     latest_close = _safe_float(latest.get(close_key))
     prev_close = _safe_float(prev.get(close_key))
     if latest_close is None or prev_close is None or prev_close == 0:
@@ -2288,8 +2674,7 @@ def _fetch_quote_from_fmp(symbol: str, api_key: str) -> _QuoteSnapshot:
     history = payload.get("historical") or []
     if len(history) < 2:
         raise RuntimeError("FMP 未返回足够的历史数据")
-    ordered = sorted(history, key=lambda item: item.get("date"), reverse=True)
-    latest, prev = ordered[0], ordered[1]
+    latest, prev = heapq.nlargest(2, history, key=lambda item: item.get("date"))
     day = latest.get("date")
     close = _safe_float(latest.get("close"))
     prev_close = _safe_float(prev.get("close"))
@@ -2314,8 +2699,7 @@ def _fetch_quote_from_twelve_data(symbol: str, api_key: str) -> _QuoteSnapshot:
     values = payload.get("values") if isinstance(payload, dict) else None
     if not values or len(values) < 2:
         raise RuntimeError("Twelve Data 未返回足够的时间序列")
-    ordered = sorted(values, key=lambda item: item.get("datetime"), reverse=True)
-    latest, prev = ordered[0], ordered[1]
+    latest, prev = heapq.nlargest(2, values, key=lambda item: item.get("datetime"))
     day = latest.get("datetime")
     close = _safe_float(latest.get("close"))
     prev_close = _safe_float(prev.get("close"))
@@ -2357,8 +2741,7 @@ def _fetch_quote_from_alpaca(symbol: str, key_id: str, secret: str) -> _QuoteSna
             break
     if len(bars) < 2:
         raise RuntimeError("Alpaca 未返回足够的时间序列")
-    ordered = sorted(bars, key=lambda item: str(item.get("t")))
-    prev, latest = ordered[-2], ordered[-1]
+    latest, prev = heapq.nlargest(2, reversed(bars), key=lambda item: str(item.get("t")))
     close = _safe_float(latest.get("c"))
     prev_close = _safe_float(prev.get("c"))
     if close is None or prev_close in (None, 0):
@@ -3490,7 +3873,7 @@ def _fetch_events_real(
             name="events", ok=False, message=f"Trading Economics 请求失败: {exc}"
         )
 
-    base_date = datetime.strptime(trading_day, "%Y-%m-%d").date()
+    base_date = date.fromisoformat(trading_day)
     window_end = base_date + timedelta(days=5)
     events: List[Dict[str, Any]] = []
     for entry in payload:
@@ -3499,7 +3882,7 @@ def _fetch_events_real(
         if not date_str or not event_name:
             continue
         try:
-            event_date = datetime.fromisoformat(date_str.replace("Z", "+00:00")).date()
+            event_date = datetime.fromisoformat(date_str).date()
         except ValueError:
             continue
         if not (base_date <= event_date <= window_end):
@@ -3537,7 +3920,7 @@ def _fetch_finnhub_earnings(
             name="finnhub_earnings", ok=False, message="缺少 Finnhub API Key"
         )
 
-    start = datetime.strptime(trading_day, "%Y-%m-%d").date()
+    start = date.fromisoformat(trading_day)
     end = start + timedelta(days=5)
     params = {
         "from": trading_day,
@@ -3561,7 +3944,7 @@ def _fetch_finnhub_earnings(
         if not date_str or not symbol:
             continue
         try:
-            event_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            event_date = date.fromisoformat(date_str)
         except ValueError:
             continue
         if not (start <= event_date <= end):
@@ -3697,6 +4080,11 @@ def _simulate_events(trading_day: str) -> Tuple[List[Dict[str, Any]], FetchStatu
 
 
 def run(argv: Optional[List[str]] = None) -> int:
+    with http_session_scope():
+        return _run(argv)
+
+
+def _run(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--force", action="store_true", help="强制刷新当日数据")
     args = parser.parse_args(argv)
@@ -3818,7 +4206,13 @@ def run(argv: Optional[List[str]] = None) -> int:
 
     sentiment_data: Dict[str, Any] = {}
 
-    put_call_payload, put_call_status = cboe_putcall.fetch()
+    # The Cboe and AAII scrapes hit different hosts; overlap their round trips.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        put_call_future = executor.submit(cboe_putcall.fetch)
+        aaii_future = executor.submit(aaii_sentiment.fetch)
+        put_call_payload, put_call_status = put_call_future.result()
+        aaii_payload, aaii_status = aaii_future.result()
+
     statuses.append(put_call_status)
     if getattr(put_call_status, "ok", False) and put_call_payload:
         sentiment_data.update(put_call_payload)
@@ -3839,7 +4233,6 @@ def run(argv: Optional[List[str]] = None) -> int:
                 )
             )
 
-    aaii_payload, aaii_status = aaii_sentiment.fetch()
     statuses.append(aaii_status)
     if getattr(aaii_status, "ok", False) and aaii_payload:
         sentiment_data.update(aaii_payload)
@@ -1,8 +1,14 @@
+import json
 import math
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
+import pytest
+
+from daily_messenger.digest import ta_report
 from daily_messenger.digest.ta_report import (
     Candle,
+    CandleSeries,
     ReportOutputConfig,
     TAReportConfig,
     ThresholdConfig,
@@ -42,6 +48,12 @@ def test_moving_average_basic() -> None:
     assert result[3] == 3.5
 
 
+def test_moving_average_shorter_than_window() -> None:
+    result = _moving_average([1.0, 2.0], 3)
+    assert len(result) == 2
+    assert all(math.isnan(value) for value in result)
+
+
 def test_relative_strength_index_progression() -> None:
     values = [1, 2, 3, 2, 1, 2, 3]
     rsi = _relative_strength_index([float(v) for v in values], 3)
@@ -49,18 +61,42 @@ def test_relative_strength_index_progression() -> None:
     assert rsi[3] != rsi[4]  # RSI responds to price changes
 
 
+def test_relative_strength_index_edge_values() -> None:
+    flat = _relative_strength_index([5.0] * 6, 3)
+    rising = _relative_strength_index([float(v) for v in range(6)], 3)
+    assert all(math.isnan(value) for value in flat[:3])
+    assert list(flat[3:]) == [50.0, 50.0, 50.0]
+    assert list(rising[3:]) == [100.0, 100.0, 100.0]
+    # Wilder seed: mean gain 2/3, mean loss 1/3 over the first three moves.
+    assert _relative_strength_index([1.0, 2.0, 3.0, 2.0], 3)[3] == pytest.approx(
+        100.0 - 100.0 / 3.0
+    )
+
+
 def test_average_true_range_matches_range_when_increasing() -> None:
     base = datetime(2024, 1, 1, tzinfo=timezone.utc)
     candles = [_make_candle(base + timedelta(days=idx), 1800 + idx) for idx in range(5)]
-    atr = _average_true_range(candles, 3)
+    atr = _average_true_range(CandleSeries.from_candles(candles), 3)
     assert len(atr) == len(candles)
     assert atr[-1] > 0.0
 
 
+def test_average_true_range_uses_previous_close_gaps() -> None:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    candles = [
+        Candle(base, True, 10.0, 11.0, 9.0, 10.0, 1),
+        # Gap up: |high - prev_close| = 10 dominates the 2.0 intraday range.
+        Candle(base + timedelta(days=1), True, 19.0, 20.0, 18.0, 19.0, 1),
+    ]
+    atr = _average_true_range(CandleSeries.from_candles(candles), 2)
+    assert math.isnan(atr[0])
+    assert atr[1] == pytest.approx(6.0)
+
+
 def test_pivot_levelsUses_last_completed() -> None:
     base = datetime(2024, 1, 1, tzinfo=timezone.utc)
     candles = [_make_candle(base + timedelta(days=idx), 1900 + idx) for idx in range(3)]
-    levels = _pivot_levels(candles)
+    levels = _pivot_levels(CandleSeries.from_candles(candles))
     assert set(levels.keys()) == {
         "P",
         "S1",
@@ -74,6 +110,28 @@ def test_pivot_levelsUses_last_completed() -> None:
     assert levels["prev_close"] == candles[-1].close
 
 
+def test_pivot_levels_skip_incomplete_tail() -> None:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    candles = [
+        _make_candle(base, 1900.0),
+        _make_candle(base + timedelta(days=1), 1950.0, complete=False),
+    ]
+    levels = _pivot_levels(CandleSeries.from_candles(candles))
+    assert levels["prev_close"] == 1900.0
+    assert levels["P"] == pytest.approx(1900.0)
+
+    with pytest.raises(RuntimeError):
+        _pivot_levels(CandleSeries.from_candles([candles[1]]))
+    assert CandleSeries.from_candles([]).last_complete_index() is None
+
+
+def test_candle_series_round_trips_timestamps() -> None:
+    base = datetime(2024, 1, 2, 22, 0, tzinfo=timezone.utc)
+    series = CandleSeries.from_candles([_make_candle(base, 1.0)])
+    assert len(series) == 1
+    assert series.timestamp(-1) == base
+
+
 def test_near_level_detects_small_distance() -> None:
     assert _near_level(100.1, 100.0, 0.002)
     assert not _near_level(102.0, 100.0, 0.002)
@@ -110,3 +168,160 @@ def test_generate_report_markdown_contains_sections() -> None:
     assert "## 支撑与压力" in markdown
     assert "## 盘中观察" in markdown
     assert "## 交易提示" in markdown
+
+
+class _FakeResponse:
+    def __init__(self, payload: dict) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode("utf-8")
+
+
+def test_fetch_candles_builds_sorted_series(monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = {
+        "candles": [
+            {
+                "time": "2024-01-03T22:00:00.000000000Z",
+                "complete": False,
+                "volume": 7,
+                "mid": {"o": "2", "h": "3", "l": "1", "c": "2.5"},
+            },
+            {"time": "2024-01-02T22:00:00.000000000Z", "complete": True},
+            {
+                "time": "2024-01-02T22:00:00.000000000Z",
+                "complete": True,
+                "volume": 5,
+                "mid": {"o": "1", "h": "2", "l": "0.5", "c": "1.5"},
+            },
+        ]
+    }
+    calls: list[dict] = []
+
+    class _FakeSession:
+        def get(self, url: str, **kwargs: object) -> _FakeResponse:
+            calls.append(kwargs)
+            return _FakeResponse(payload)
+
+    monkeypatch.setattr(ta_report, "_SESSION", _FakeSession())
+
+    series = ta_report.fetch_candles("XAU_USD", "D", "token")
+
+    assert len(series) == 2
+    assert series.close.tolist() == [1.5, 2.5]
+    assert series.complete.tolist() == [True, False]
+    assert series.volume.tolist() == [5, 7]
+    assert series.timestamp(0) == datetime(2024, 1, 2, 22, 0, tzinfo=timezone.utc)
+    assert calls[0]["headers"] == {"Authorization": "Bearer token"}
+
+
+def test_run_keeps_report_when_an_intraday_fetch_fails(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output = tmp_path / "report.md"
+    config = tmp_path / "ta.yml"
+    config.write_text(
+        "instrument: XAU_USD\n"
+        "windows: {sma_fast: 3, sma_slow: 5, rsi: 3, atr: 3}\n"
+        f"report: {{filename: '{output}', include_intraday: true,"
+        " intraday_granularities: [H1, M5]}\n"
+        "thresholds: {rsi_overbought: 70, rsi_oversold: 30, near_pct: 0.001}\n",
+        encoding="utf-8",
+    )
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    daily = CandleSeries.from_candles(
+        [_make_candle(base + timedelta(days=idx), 1900 + idx) for idx in range(8)]
+    )
+
+    def fake_fetch(instrument, granularity, token, count=400, **kwargs):
+        if granularity == "M5":
+            raise RuntimeError("boom")
+        return daily
+
+    monkeypatch.setattr(ta_report, "fetch_candles", fake_fetch)
+    monkeypatch.setenv("OANDA_TOKEN", "token")
+
+    assert ta_report.run(["--config", str(config)]) == 0
+    text = output.read_text(encoding="utf-8")
+    assert "- H1 最新价" in text
+    assert "M5" not in text
+
+
+def test_terminal_indicators_match_series_tails() -> None:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    closes = [1900 + 15 * math.sin(idx / 3) for idx in range(40)]
+    series = CandleSeries.from_candles(
+        [_make_candle(base + timedelta(days=idx), close) for idx, close in enumerate(closes)]
+    )
+    windows = WindowsConfig(sma_fast=5, sma_slow=20, rsi=14, atr=14)
+
+    values = ta_report._terminal_indicators(series, windows)
+
+    assert values["sma_fast"] == pytest.approx(_moving_average(closes, 5)[-1])
+    assert values["sma_slow"] == pytest.approx(_moving_average(closes, 20)[-1])
+    assert values["rsi"] == pytest.approx(_relative_strength_index(closes, 14)[-1])
+    assert values["atr"] == pytest.approx(_average_true_range(series, 14)[-1])
+
+    short = ta_report._terminal_indicators(
+        series, WindowsConfig(sma_fast=5, sma_slow=50, rsi=40, atr=41)
+    )
+    assert math.isnan(short["sma_slow"])
+    assert math.isnan(short["rsi"])
+    assert math.isnan(short["atr"])
+
+
+def test_fetch_candles_cached_requests_only_new_bars(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pytest.importorskip("pyarrow")
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    history = [_make_candle(base + timedelta(days=idx), 1900 + idx) for idx in range(5)]
+    history[-1] = _make_candle(history[-1].time, 1904, complete=False)
+    calls: list[dict] = []
+
+    def fake_fetch(instrument, granularity, token, count=400, since=None, **kwargs):
+        calls.append({"count": count, "since": since})
+        if since is None:
+            return CandleSeries.from_candles(history)
+        # The incomplete bar closed and a new one opened.
+        return CandleSeries.from_candles(
+            [
+                _make_candle(since, 1903),
+                _make_candle(base + timedelta(days=4), 1910),
+                _make_candle(base + timedelta(days=5), 1920, complete=False),
+            ]
+        )
+
+    monkeypatch.setattr(ta_report, "fetch_candles", fake_fetch)
+
+    first = ta_report.fetch_candles_cached(tmp_path, "XAU_USD", "D", "t", count=5)
+    second = ta_report.fetch_candles_cached(tmp_path, "XAU_USD", "D", "t", count=5)
+
+    assert len(first) == 5
+    assert calls[0]["since"] is None
+    assert calls[1]["since"] == base + timedelta(days=3)
+    assert second.close.tolist() == [1901.0, 1902.0, 1903.0, 1910.0, 1920.0]
+    assert second.complete.tolist() == [True, True, True, True, False]
+    assert (tmp_path / "XAU_USD_D.parquet").exists()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-01-02T22:00:00.000000000Z",
+        "2024-01-02T22:00:00+00:00",
+        "2024-01-02T17:00:00-05:00",
+    ],
+)
+def test_parse_time_normalises_to_utc(value: str) -> None:
+    expected = datetime(2024, 1, 2, 22, 0, tzinfo=timezone.utc)
+    parsed = ta_report._parse_time(value)
+    assert parsed == expected
+    assert parsed.utcoffset() == timedelta(0)
+    column = np.empty(1, dtype="datetime64[us]")
+    column[0] = ta_report._utc_datetime64(value)
+    assert column[0] == np.datetime64("2024-01-02T22:00:00")
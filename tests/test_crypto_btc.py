@@ -1,6 +1,7 @@
 from datetime import timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -46,3 +47,206 @@ def test_build_report_generates_markdown(tmp_path, monkeypatch):
     data = out.read_text(encoding="utf-8")
     assert data.startswith("# BTC/USDT 每日技术简报")
     assert "## 枢轴位" in data
+
+
+def _write_klines(path: Path, periods: int, freq: str = "D") -> pd.DataFrame:
+    times = pd.date_range("2024-01-01", periods=periods, freq=freq, tz="UTC")
+    values = pd.Series(range(periods), dtype="float64")
+    frame = pd.DataFrame(
+        {
+            "open_time": times,
+            "open": values + 100,
+            "high": values + 105,
+            "low": values + 95,
+            "close": values + 102,
+            "volume": values + 10,
+            "close_time": times,
+            "symbol": "BTCUSDT",
+            "interval": "1d",
+        }
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    frame.to_parquet(path, index=False)
+    return frame
+
+
+def test_load_parquet_prunes_columns(tmp_path):
+    _write_klines(tmp_path / "klines_1d.parquet", periods=5)
+
+    df = report._load_parquet(tmp_path, "1d")
+    assert list(df.columns) == ["open", "high", "low", "close"]
+    assert df.index.name == "open_time"
+    assert report._load_parquet(tmp_path, "1h").empty
+
+
+def test_latest_open_time_reads_parquet_statistics(tmp_path):
+    path = tmp_path / "klines_1d.parquet"
+    assert klines._latest_open_time(path) is None
+
+    frame = _write_klines(path, periods=5)
+    latest = klines._latest_open_time(path)
+    assert latest == frame["open_time"].iloc[-1].to_pydatetime()
+    assert latest.tzinfo is not None
+
+
+def test_pivots_vectorized_matches_scalar():
+    pp, r1, s1, r2, s2, r3, s3 = report.pivots(110.0, 90.0, 100.0)
+    assert pp == pytest.approx(100.0)
+    assert (r1, s1, r2, s2, r3, s3) == pytest.approx((110.0, 90.0, 120.0, 80.0, 130.0, 70.0))
+
+    levels = report.pivots([110.0, 120.0], [90.0, 100.0], [100.0, 110.0])
+    assert levels.shape == (7, 2)
+    assert levels[:, 0] == pytest.approx([100.0, 110.0, 90.0, 120.0, 80.0, 130.0, 70.0])
+
+
+def test_rsi_wilder_smoothing():
+    close = pd.Series([100.0, 101.0] * 40)
+    values = report.rsi(close, 14)
+    assert values.iloc[:13].isna().all()
+    assert values.iloc[-1] == pytest.approx(50.0, abs=3.0)
+    assert values.index.equals(close.index)
+
+
+def test_fetch_one_parses_zipped_csv(monkeypatch):
+    import io
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(
+            "BTCUSDT-1d-2024-01-01.csv",
+            "1704067200000,42000.1,42500,41800,42300.5,100,1704153599999,4200000,1000,50,2100000,0\n",
+        )
+
+    class _Response:
+        status_code = 200
+        content = buffer.getvalue()
+
+    class _Session:
+        def get(self, *args, **kwargs):
+            return _Response()
+
+    monkeypatch.setattr(klines, "_SESSION", _Session())
+    df = klines.fetch_one("BTCUSDT", "1d", "2024-01-01")
+    assert len(df) == 1
+    assert df["close"].iloc[0] == pytest.approx(42300.5)
+    assert str(df["open_time"].dt.tz) == "UTC"
+    assert df["interval"].iloc[0] == "1d"
+
+
+def test_daily_indicators_reuse_cache(tmp_path):
+    frame = _write_klines(tmp_path / "klines_1d.parquet", periods=460).set_index("open_time")
+    frame["close"] = 100 + 10 * np.sin(np.arange(len(frame)) / 5)
+    full = report._compute_daily_indicators(frame)
+
+    first = report._daily_indicators(frame, tmp_path)
+    assert first.index.equals(frame.index[-report.INDICATOR_WARMUP :])
+    pd.testing.assert_frame_equal(first, full.loc[first.index], rtol=1e-6)
+    cache = pd.read_parquet(tmp_path / report.INDICATOR_CACHE)
+    assert len(cache) == report.INDICATOR_WARMUP - 1
+
+    extended = pd.concat(
+        [frame, frame.iloc[[-1]].set_axis([frame.index[-1] + pd.Timedelta(days=1)]).assign(close=120.0)]
+    )
+    second = report._daily_indicators(extended, tmp_path)
+    full = report._compute_daily_indicators(extended)
+    assert second.index[-1] == extended.index[-1]
+    assert second["SMA200"].iloc[-1] == pytest.approx(full["SMA200"].iloc[-1])
+    assert second["RSI14"].iloc[-1] == pytest.approx(full["RSI14"].iloc[-1], rel=1e-6)
+    assert len(pd.read_parquet(tmp_path / report.INDICATOR_CACHE)) == report.INDICATOR_WARMUP
+
+    rewritten = extended.assign(close=extended["close"] + 1)
+    third = report._daily_indicators(rewritten, tmp_path)
+    assert third.index.equals(rewritten.index[-report.INDICATOR_WARMUP :])
+    assert third["SMA50"].iloc[-1] == pytest.approx(full["SMA50"].iloc[-1] + 1)
+
+
+def test_build_report_reads_intraday_tail(tmp_path):
+    _write_klines(tmp_path / "klines_1d.parquet", periods=30)
+    hourly = _write_klines(tmp_path / "klines_1h.parquet", periods=100, freq="h")
+
+    tail = report._load_parquet_tail(tmp_path, "1h", 24)
+    assert len(tail) == 24
+    assert list(tail.columns) == ["close"]
+    assert tail.index[-1] == hourly["open_time"].iloc[-1]
+
+    out = tmp_path / "btc_report.md"
+    report.build_report(datadir=tmp_path, outpath=out, config_path=None)
+    text = out.read_text(encoding="utf-8")
+    assert "## 小时级快照" in text
+    assert f"近 24 根均价: {hourly['close'].tail(24).mean():.2f}" in text
+    assert "## 分钟级快照" not in text
+
+
+def test_incremental_fetch_appends_past_boundary(tmp_path, monkeypatch):
+    existing = _write_klines(tmp_path / "klines_1d.parquet", periods=5)
+    page = _write_klines(tmp_path / "page" / "klines_1d.parquet", periods=8).iloc[2:]
+    page = page.assign(close=page["close"] + 1000)
+    last_page_ms = int(page["open_time"].iloc[-1].timestamp() * 1000)
+
+    def fake_fetch_binance(symbol, interval, start_ms, end_ms, limit=1000):
+        if start_ms > last_page_ms:
+            return pd.DataFrame()
+        return page.iloc[::-1].copy()
+
+    monkeypatch.setattr(klines, "fetch_binance", fake_fetch_binance)
+    monkeypatch.setattr(klines.time, "sleep", lambda _seconds: None)
+
+    outpath = klines.incremental_fetch(interval="1d", outdir=tmp_path, max_pages=5)
+    stored = pd.read_parquet(outpath)
+    assert len(stored) == 8
+    assert stored["open_time"].is_monotonic_increasing
+    assert stored["open_time"].is_unique
+    # Stored bars win over re-fetched overlap; new bars are appended.
+    assert stored["close"].iloc[:5].tolist() == existing["close"].tolist()
+    assert stored["close"].iloc[5:].tolist() == page["close"].iloc[3:].tolist()
+
+
+def test_fmt_handles_missing_and_numeric_values():
+    assert report._fmt(1.23456) == "1.23"
+    assert report._fmt(np.float64(2.5), nd=1) == "2.5"
+    assert report._fmt(3, nd=0) == "3"
+    assert report._fmt("4.5") == "4.50"
+    assert report._fmt(1.0, nd=8) == "1.00000000"
+    for missing in (None, float("nan"), np.nan, float("inf"), -np.inf, pd.NA, "n/a"):
+        assert report._fmt(missing) == "—"
+
+
+def test_load_config_reparses_after_change(tmp_path):
+    import os
+
+    cfg = tmp_path / "ta.yml"
+    assert report._load_config(cfg) == {}
+
+    cfg.write_text("report:\n  title: first\n", encoding="utf-8")
+    assert report._load_config(cfg)["report"]["title"] == "first"
+    assert report._load_config(cfg) is report._load_config(cfg)
+
+    cfg.write_text("report:\n  title: second\n", encoding="utf-8")
+    stat = cfg.stat()
+    os.utime(cfg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert report._load_config(cfg)["report"]["title"] == "second"
+
+
+def test_write_frames_promotes_provider_schemas(tmp_path):
+    outpath = tmp_path / "klines_1h.parquet"
+    binance = _write_klines(outpath, periods=3, freq="h")
+    kraken = pd.DataFrame(
+        {
+            "open_time": [binance["open_time"].iloc[-1] + pd.Timedelta(hours=1)],
+            "open": [1.0],
+            "high": [2.0],
+            "low": [0.5],
+            "close": [1.5],
+            "volume": [3.0],
+            "close_time": [binance["open_time"].iloc[-1] + pd.Timedelta(hours=1)],
+            "quote_asset_volume": [pd.NA],
+            "symbol": ["XBTUSD"],
+        }
+    )
+
+    assert klines._write_frames([kraken], outpath, append=True) == 4
+    stored = pd.read_parquet(outpath)
+    assert stored["close"].tolist() == binance["close"].tolist() + [1.5]
+    assert stored["interval"].iloc[-1] is None
+    assert stored["quote_asset_volume"].isna().all()
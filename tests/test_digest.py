@@ -1,8 +1,10 @@
 import json
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
+from jinja2.environment import TemplateStream
 
 from daily_messenger.digest import make_daily as digest
 
@@ -50,6 +52,22 @@ def test_build_card_payload_contains_summary_and_url():
     )
 
 
+@pytest.mark.parametrize(
+    ("news", "stocks", "expected"),
+    [
+        (["A"], None, "**新闻** A"),
+        (None, ["NVDA +1.00%"], "**成分股** NVDA +1.00%"),
+        (["A", "B"], ["X"], "**新闻** A ｜ B\n**成分股** X"),
+    ],
+)
+def test_build_card_payload_preview_content(news, stocks, expected):
+    payload = digest._build_card_payload(
+        "内参", ["line"], "https://example.com", news_preview=news, stock_preview=stocks
+    )
+
+    assert payload["elements"][1]["text"]["content"] == expected
+
+
 def test_run_generates_digest_outputs(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -95,7 +113,9 @@ def test_run_generates_digest_outputs(
 
     assert exit_code == 0
     assert (tmp_path / "index.html").exists()
-    assert (tmp_path / "2024-04-01.html").exists()
+    assert (tmp_path / "2024-04-01.html").read_bytes() == (
+        tmp_path / "index.html"
+    ).read_bytes()
 
     summary_text = (tmp_path / "digest_summary.txt").read_text(encoding="utf-8")
     assert "AI 总分 82" in summary_text
@@ -268,3 +288,219 @@ def test_run_writes_market_news_from_ai_updates(
     assert "AI 市场资讯（GLM）" in html_report
     assert "美股 · 2024-04-05" in html_report
     assert "A 股要点" in html_report
+
+
+def test_report_template_is_compiled_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    template_dir = Path(digest.__file__).resolve().parent / "templates"
+    monkeypatch.setattr(digest, "TEMPLATE_DIR", template_dir)
+
+    first = digest._report_template()
+    assert digest._report_template() is first
+    assert digest._build_env(template_dir).auto_reload is False
+
+
+def test_filter_future_events_orders_by_date_without_mutation():
+    events = [
+        {"title": "C", "date": "2024-04-05"},
+        {"title": "past", "date": "2024-03-30"},
+        {"title": "A", "date": "2024-04-02"},
+        {"title": "bad", "date": "soon"},
+        {"title": "B", "date": "2024-04-02"},
+        {"title": "D", "date": "2024-4-9"},
+        "not-a-dict",
+    ]
+    future = digest._filter_future_events(events, date(2024, 4, 1))
+
+    assert [item["title"] for item in future] == ["A", "B", "C", "D"]
+    assert all(set(item) == {"title", "date"} for item in future)
+
+
+def test_coerce_themes_matches_payload_round_trip():
+    raw = [
+        {
+            "name": "ai",
+            "total": "81.5",
+            "breakdown": {"fundamental": "70", "valuation": "n/a"},
+            "breakdown_detail": {"valuation": {"fallback": True}, "skip": 3},
+            "meta": {"delta": 1.5},
+        },
+        {"label": "missing-name"},
+        "not-a-mapping",
+    ]
+    themes = digest._coerce_themes(raw)
+
+    assert themes == [digest.ThemePayload.from_mapping(raw[0]).to_mapping()]
+    assert themes[0]["label"] == "ai"
+    assert themes[0]["breakdown"] == {"fundamental": 70.0}
+    assert themes[0]["breakdown_detail"] == {"valuation": {"fallback": True}}
+    assert digest._coerce_actions([{"action": "增持", "name": "AI"}, {"name": "x"}]) == [
+        {"action": "增持", "name": "AI", "reason": ""}
+    ]
+
+
+def test_from_mapping_accepts_read_only_mapping():
+    payload = MappingProxyType({"name": "ai", "total": 80, "breakdown": {"event": 5}})
+
+    theme = digest.ThemePayload.from_mapping(payload)
+
+    assert theme.name == "ai"
+    assert theme.breakdown == {"event": 5.0}
+
+    detail = {"valuation": {"fallback": True}}
+    nested = {
+        "name": "btc",
+        "breakdown": MappingProxyType({"event": 7}),
+        "breakdown_detail": MappingProxyType(
+            {"valuation": MappingProxyType({"fallback": True}), "raw": detail["valuation"]}
+        ),
+        "meta": MappingProxyType({"delta": 1.0}),
+    }
+    theme = digest.ThemePayload.from_mapping(nested)
+    detail["valuation"]["fallback"] = False
+
+    assert theme.breakdown == {"event": 7.0}
+    assert theme.breakdown_detail == {
+        "valuation": {"fallback": True},
+        "raw": {"fallback": True},
+    }
+    assert theme.meta == {"delta": 1.0}
+
+
+def test_run_previews_largest_symbol_moves(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(digest, "OUT_DIR", tmp_path)
+    monkeypatch.setattr(digest, "TEMPLATE_DIR", tmp_path / "templates")
+
+    symbols = [
+        {"symbol": "AAPL", "change_pct": 0.4},
+        {"change_pct": -9.0},
+        {"symbol": "NVDA", "change_pct": -3.1},
+        {"symbol": "MSFT", "change_pct": "n/a", "price": 420.5},
+        {"symbol": "META", "change_pct": 1.9},
+        {"symbol": "TSLA", "change_pct": 2.2},
+    ]
+    scores_payload = {
+        "date": "2024-04-01",
+        "themes": [],
+        "theme_details": {"magnificent7": {"symbols": symbols}},
+    }
+    _write_json(tmp_path / "scores.json", scores_payload)
+    _write_json(tmp_path / "actions.json", {"items": []})
+
+    assert digest.run([]) == 0
+
+    card_payload = json.loads((tmp_path / "digest_card.json").read_text(encoding="utf-8"))
+    preview = next(
+        element["text"]["content"]
+        for element in card_payload["elements"]
+        if element.get("text", {}).get("content", "").startswith("**成分股**")
+    )
+    assert preview == "**成分股** NVDA -3.10% ｜ TSLA +2.20% ｜ META +1.90%"
+
+
+def test_link_or_copy_replaces_target_and_falls_back(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "2024-04-01.html"
+    target = tmp_path / "index.html"
+    source.write_text("new", encoding="utf-8")
+    target.write_text("old", encoding="utf-8")
+
+    digest._link_or_copy(source, target)
+    assert target.read_text(encoding="utf-8") == "new"
+
+    def refuse_link(*_args, **_kwargs):
+        raise OSError("hardlinks unsupported")
+
+    monkeypatch.setattr(digest.os, "link", refuse_link)
+    next_source = tmp_path / "2024-04-02.html"
+    next_source.write_text("copied", encoding="utf-8")
+    digest._link_or_copy(next_source, target)
+    assert target.read_text(encoding="utf-8") == "copied"
+    assert source.read_text(encoding="utf-8") == "new"
+
+
+def test_format_theme_line_joins_present_fields():
+    theme = {
+        "label": "AI",
+        "total": 82.3,
+        "breakdown": {"fundamental": 78.0, "valuation": 65.0},
+        "breakdown_detail": {"valuation": {"fallback": True}},
+        "meta": {"delta": 2.5, "distance_to_add": -7.3},
+    }
+    assert digest._format_theme_line(theme) == "AI 总分 82 (Δ +2.5)｜基本面 78｜估值 ∅｜距增持 -7"
+    assert digest._format_theme_line({"name": "btc", "total": None}) == "btc 总分 —"
+    # Labels are passed as values, so braces never reach the format template.
+    assert (
+        digest._format_theme_line({"label": "{x}", "total": 5, "breakdown": {"valuation": 40}})
+        == "{x} 总分 5｜估值 40"
+    )
+
+
+def test_build_summary_lines_stops_at_limit():
+    themes = [_theme(f"T{i}", 50 + i) for i in range(15)]
+    actions = [{"action": "增持", "name": "AI", "reason": "r"}]
+    lines = digest._build_summary_lines(themes, actions, degraded=False)
+    assert len(lines) == 12
+    assert lines[-1].startswith("T11 总分")
+
+
+def test_load_json_missing_file(tmp_path):
+    missing = tmp_path / "absent.json"
+
+    assert digest._load_json(missing, required=False) == {}
+    with pytest.raises(FileNotFoundError, match="缺少输入文件"):
+        digest._load_json(missing)
+
+
+def test_largest_moves_matches_heapq_on_long_lists():
+    import heapq
+    import random
+
+    rng = random.Random(7)
+    ranked = [(float(rng.choice([0, 1, 2, 3, 5, 5])), {"i": i}) for i in range(80)]
+
+    expected = [item for _, item in heapq.nlargest(3, ranked, key=lambda pair: pair[0])]
+    assert digest._largest_moves(ranked, 3) == expected
+    assert digest._largest_moves(ranked[:5], 3) == [
+        item for _, item in heapq.nlargest(3, ranked[:5], key=lambda pair: pair[0])
+    ]
+
+
+def test_largest_moves_ranks_nan_scores_as_flat():
+    nan = float("nan")
+    size = digest.VECTOR_RANK_MIN + 8
+    ranked = [(float(i % 7), {"i": i}) for i in range(size)]
+    for index in (0, 13, 27):
+        ranked[index] = (nan, {"i": index})
+
+    picked = digest._largest_moves(ranked, 3)
+
+    assert len(picked) == 3
+    assert all(ranked[item["i"]][0] == 6.0 for item in picked)
+    assert digest._largest_moves(ranked[:8], 3) == [{"i": 6}, {"i": 5}, {"i": 4}]
+    assert len(digest._largest_moves([(nan, {"i": i}) for i in range(size)], 3)) == 3
+
+
+def test_render_report_keeps_previous_file_on_template_error(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    target = tmp_path / "2024-04-01.html"
+    target.write_text("previous", encoding="utf-8")
+
+    class _Broken:
+        def stream(self, **_payload):
+            def chunks():
+                yield "<html>partial"
+                raise RuntimeError("template failed")
+
+            return TemplateStream(chunks())
+
+    monkeypatch.setattr(digest, "_report_template", lambda: _Broken())
+
+    with pytest.raises(RuntimeError, match="template failed"):
+        digest._render_report({}, target)
+
+    assert target.read_text(encoding="utf-8") == "previous"
+    assert [p.name for p in tmp_path.iterdir()] == ["2024-04-01.html"]
@@ -1,7 +1,9 @@
 import importlib
 import json
+import os
 import sys
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 import pytest
 
@@ -65,7 +67,7 @@ def test_fetch_ai_rss_events_parses_items(monkeypatch, load_run_fetch):
             raise module.requests.RequestException("boom")
         return DummyResponse(rss_payload)
 
-    monkeypatch.setattr(module.requests, "get", fake_get)
+    monkeypatch.setattr(module, "_SESSION", SimpleNamespace(get=fake_get))
 
     events, statuses = module._fetch_ai_rss_events(module.AI_NEWS_FEEDS)
     assert len(events) == 2
@@ -91,7 +93,7 @@ def test_fetch_arxiv_events_parses_entries(monkeypatch, load_run_fetch):
         assert params["search_query"] == module.ARXIV_QUERY_PARAMS["search_query"]
         return DummyResponse(feed_payload)
 
-    monkeypatch.setattr(module.requests, "get", fake_get)
+    monkeypatch.setattr(module, "_SESSION", SimpleNamespace(get=fake_get))
 
     events, status = module._fetch_arxiv_events(module.ARXIV_QUERY_PARAMS, 0)
     assert status.ok
@@ -381,3 +383,642 @@ def test_resolve_ai_news_settings_defaults_to_glm(monkeypatch, load_run_fetch):
     assert settings.thinking == "enabled"
     tokens = {token for _, token in settings.keys}
     assert "GLM_KEY_PRIMARY" in tokens
+
+
+def test_request_json_reuses_module_session(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    calls = []
+    bodies = []
+
+    class _Response:
+        status_code = 200
+        content = b'{"ok": true}'
+
+        def raise_for_status(self) -> None:
+            return None
+
+    class _Session:
+        def request(self, method, url, **kwargs):
+            calls.append((method, url, kwargs["headers"]["User-Agent"]))
+            bodies.append(kwargs["data"])
+            return _Response()
+
+    monkeypatch.setattr(module, "_SESSION", _Session())
+
+    assert module._request_json("https://example.com/a") == {"ok": True}
+    assert (
+        module._request_json(
+            "https://example.com/b", method="POST", json_body={"q": "黄金"}
+        )
+        == {"ok": True}
+    )
+    assert bodies[0] is None
+    assert json.loads(bodies[1]) == {"q": "黄金"}
+    assert [url for _, url, _ in calls] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert all(agent == module.USER_AGENT for _, _, agent in calls)
+
+
+def test_resolve_market_trading_date_rolls_back_before_close(load_run_fetch):
+    module = load_run_fetch({})
+    us_spec = module.AI_NEWS_MARKET_SPECS[0]
+
+    # 2024-04-08 is a Monday; 13:00 UTC is before the New York close.
+    before_close = datetime(2024, 4, 8, 13, 0, tzinfo=timezone.utc)
+    after_close = datetime(2024, 4, 8, 21, 0, tzinfo=timezone.utc)
+
+    assert module._resolve_market_trading_date(before_close, us_spec).date() == (
+        datetime(2024, 4, 5).date()
+    )
+    assert module._resolve_market_trading_date(after_close, us_spec).date() == (
+        datetime(2024, 4, 8).date()
+    )
+
+
+def test_fetch_ai_rss_events_reads_atom_entries_and_caps_items(
+    monkeypatch, load_run_fetch
+):
+    module = load_run_fetch({})
+    entries = "".join(
+        f"<entry><title>Post {i}</title><updated>2024-04-0{i}T08:00:00Z</updated>"
+        f'<link href="https://example.com/{i}"/></entry>'
+        for i in range(1, 8)
+    )
+    atom_payload = f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+    monkeypatch.setattr(
+        module,
+        "_SESSION",
+        SimpleNamespace(get=lambda *args, **kwargs: DummyResponse(atom_payload)),
+    )
+
+    events, statuses = module._fetch_ai_rss_events(["https://example.com/atom"])
+
+    assert [event["title"] for event in events] == [f"Post {i}" for i in range(1, 6)]
+    assert events[0]["date"] == "2024-04-01"
+    assert events[0]["url"] == "https://example.com/1"
+    assert statuses[0].ok
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("Mon, 01 Apr 2024 10:00:00 GMT", "2024-04-01"),
+        ("2024-04-02T08:00:00Z", "2024-04-02"),
+        ("2024-04-03T23:30:00-05:00", "2024-04-03"),
+        ("  ", None),
+        ("not a date", None),
+    ],
+)
+def test_normalize_rss_date_handles_rfc2822_and_iso(load_run_fetch, raw, expected):
+    module = load_run_fetch({})
+
+    assert module._normalize_rss_date(raw) == expected
+
+
+def test_load_api_keys_rereads_file_after_edit(tmp_path, monkeypatch, load_run_fetch):
+    module = load_run_fetch(None)
+    keys_file = tmp_path / "keys.json"
+    keys_file.write_text(json.dumps({"finnhub": "first"}), encoding="utf-8")
+    monkeypatch.setenv("API_KEYS_PATH", str(keys_file))
+    monkeypatch.delenv("FINNHUB", raising=False)
+    monkeypatch.delenv("finnhub", raising=False)
+
+    assert module._load_api_keys(None)["finnhub"] == "first"
+
+    keys_file.write_text(json.dumps({"finnhub": "second"}), encoding="utf-8")
+    stat = keys_file.stat()
+    os.utime(keys_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert module._load_api_keys(None)["finnhub"] == "second"
+
+
+def test_extract_news_section_joins_tagged_blocks(load_run_fetch):
+    module = load_run_fetch({})
+
+    text = "前言<news>\n- A\n</news>中间<NEWS> - B </NEWS><news>  </news>"
+    assert module._extract_news_section(text) == "- A\n- B"
+    assert module._extract_news_section("<news>   </news>") == ""
+    assert module._extract_news_section("  纯文本  ") == "纯文本"
+
+
+def test_request_json_retries_retryable_status(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    responses = []
+    sleeps = []
+
+    class _Response:
+        def __init__(self, status_code):
+            self.status_code = status_code
+            self.headers = {"Retry-After": "0.25"}
+
+        def raise_for_status(self) -> None:
+            if self.status_code >= 400:
+                raise module.requests.HTTPError(f"status {self.status_code}")
+
+        @property
+        def content(self) -> bytes:
+            return json.dumps({"attempts": len(responses)}).encode("utf-8")
+
+    class _Session:
+        def request(self, method, url, **kwargs):
+            responses.append(url)
+            return _Response(429 if len(responses) < 3 else 200)
+
+    monkeypatch.setattr(module, "_sleep_exact", sleeps.append)
+
+    payload = module._request_json("https://example.com", session=_Session())
+
+    assert payload == {"attempts": 3}
+    assert sleeps == [0.25, 0.25]
+
+
+def test_normalize_api_keys_strips_and_reports_invalid(load_run_fetch):
+    module = load_run_fetch({})
+
+    result = module._normalize_api_keys(
+        {"finnhub": "  token ", "alpha_vantage": None, "ai_news": {"provider": "glm"}}
+    )
+    assert result == {"finnhub": "token", "ai_news": {"provider": "glm"}}
+
+    with pytest.raises(module.ApiKeyValidationError) as excinfo:
+        module._normalize_api_keys({"finnhub": 123, "sosovalue": "   "})
+    assert excinfo.value.errors == {
+        "finnhub": "expected string value",
+        "sosovalue": "empty string",
+    }
+
+
+def test_fetch_ai_market_news_batches_gemini_markets(monkeypatch, load_run_fetch):
+    config = {
+        "ai_news": {
+            "provider": "gemini",
+            "model": "gemini-test",
+            "keys": ["PRIMARY_TOKEN"],
+            "enable_network": False,
+        }
+    }
+    module = load_run_fetch(config)
+    module.THROTTLE_DISABLED = True
+    prompts = []
+
+    def fake_call(model, api_key, prompt, enable_network, timeout):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            # Batched reply covering every market except gold.
+            text = "".join(
+                f'<news market="{spec.market}">- {spec.market} 要点</news>'
+                for spec in module.AI_NEWS_MARKET_SPECS
+                if spec.market != "gold"
+            )
+        else:
+            text = "<news>- 单独补充</news>"
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+    monkeypatch.setattr(module, "_call_gemini_generate_content", fake_call)
+
+    now = datetime(2024, 4, 3, 12, 0, tzinfo=timezone.utc)
+    updates, statuses = module._fetch_ai_market_news(now, config, logger=None)
+
+    assert len(prompts) == 2
+    assert 'market="gold"' in prompts[0]
+    assert [update["market"] for update in updates] == [
+        spec.market for spec in module.AI_NEWS_MARKET_SPECS
+    ]
+    assert updates[0]["summary"] == "- us 要点"
+    assert updates[-1]["summary"] == "- 单独补充"
+    assert all(status.ok for status in statuses)
+
+
+def test_table_markup_drops_scripts_and_page_chrome(load_run_fetch):
+    module = load_run_fetch({})
+    html = (
+        "<html><head><script>var x = '<table><tr><td>bad</td></tr></table>';</script>"
+        "<style>td { color: red; }</style></head><body><nav>menu</nav>"
+        "<TABLE><tr><td>01 Apr 2024</td><td>(12.5)</td></tr></TABLE>"
+        "<table><tr><td>02 Apr 2024</td><td>3.0</td></tr></table><footer/></body></html>"
+    )
+
+    parser = module._HTMLTableParser()
+    parser.feed(module._table_markup(html))
+
+    assert parser.rows == [["01 Apr 2024", "(12.5)"], ["02 Apr 2024", "3.0"]]
+    assert module._latest_date(parser.rows) == ["02 Apr 2024", "3.0"]
+    assert module._table_markup("<p>no tables</p>") == ""
+
+
+def test_collect_ai_news_keys_reads_prefixed_fields(load_run_fetch):
+    module = load_run_fetch({})
+
+    keys = module._collect_ai_news_keys(
+        {
+            "keys": ["LIST_KEY"],
+            "GEMINI_BACKUP": "FIELD_KEY",
+            "gemini_model": "gemini-2.5-pro",
+            "Gemini_Enable_Network": "true",
+            "glm_key": "OTHER_PROVIDER",
+        },
+        "gemini",
+    )
+
+    assert keys == [("key_1", "LIST_KEY"), ("GEMINI_BACKUP", "FIELD_KEY")]
+
+
+def test_configuration_globals_load_on_first_access(monkeypatch, load_run_fetch):
+    module = load_run_fetch({"ai_feeds": ["https://example.com/lazy"]})
+
+    assert "AI_NEWS_FEEDS" not in vars(module)
+    assert module.AI_NEWS_FEEDS == ["https://example.com/lazy"]
+    assert "AI_NEWS_FEEDS" in vars(module)
+
+
+def test_http_session_scope_closes_shared_session(load_run_fetch):
+    module = load_run_fetch({})
+    module._SESSION = None
+
+    with module.http_session_scope() as session:
+        assert module._get_session() is session
+    assert module._SESSION is None
+    assert module._get_session() is not session
+
+
+def test_request_json_stops_when_backoff_exceeds_deadline(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    attempts = []
+
+    class _Session:
+        def request(self, method, url, **kwargs):
+            attempts.append(url)
+            raise module.requests.ConnectionError("boom")
+
+    monkeypatch.setattr(module, "_sleep_exact", lambda seconds: None)
+    policy = module.RetryPolicy(
+        retries=5, backoff_start=2.0, jitter=0.0, hard_deadline=1.0
+    )
+
+    with pytest.raises(RuntimeError, match="超过重试预算"):
+        module._request_json("https://example.com", session=_Session(), policy=policy)
+    assert len(attempts) == 1
+
+
+def test_business_day_on_or_before_skips_weekends(load_run_fetch):
+    module = load_run_fetch({})
+
+    # 2024-04-05 is a Friday.
+    for day in (5, 6, 7):
+        assert module._business_day_on_or_before(datetime(2024, 4, day)) == datetime(
+            2024, 4, 5
+        )
+    assert module._business_day_on_or_before(datetime(2024, 4, 8)) == datetime(
+        2024, 4, 8
+    )
+
+
+def test_load_api_keys_prefers_inline_over_loose_env(monkeypatch, load_run_fetch):
+    module = load_run_fetch({"finnhub": "INLINE"})
+    monkeypatch.setenv("FINNHUB", "ENV_FINNHUB")
+    monkeypatch.setenv("SOSOVALUE", "ENV_SOSO")
+
+    keys = module._load_api_keys(None)
+
+    assert keys["finnhub"] == "INLINE"
+    assert keys["sosovalue"] == "ENV_SOSO"
+
+
+def test_sosovalue_flow_picks_latest_iso_day(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    payload = {
+        "code": 0,
+        "data": [
+            {"date": "2024-04-02T00:00:00", "totalNetInflow": 5_000_000},
+            {"date": "2024-04-03", "totalNetInflow": -2_500_000},
+            {"date": "not-a-day", "totalNetInflow": 9_000_000},
+            {"date": "2024-04-01", "totalNetInflow": 1_000_000},
+        ],
+    }
+    monkeypatch.setattr(module, "_request_json", lambda *args, **kwargs: payload)
+
+    amount, status = module._fetch_sosovalue_latest_flow("KEY")
+
+    assert amount == -2.5
+    assert status.ok
+    assert "2024-04-03" in status.message
+
+
+def test_latest_date_uses_newest_valid_day(load_run_fetch):
+    module = load_run_fetch({})
+    rows = [
+        ["Date", "IBIT", "Total"],
+        ["05 Apr 2024", "1.0", "2.0"],
+        ["31 Feb 2024", "9.9", "9.9"],
+        ["8 apr 2024", "3.0", "4.0"],
+        ["Total", "", "6.0"],
+    ]
+
+    assert module._latest_date(rows) == ["8 apr 2024", "3.0", "4.0"]
+    assert module._parse_day_month_year("01 April 2024") is None
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("1,234.5", 1234.5),
+        ("(12.5)", -12.5),
+        ("−3.0", -3.0),
+        (" - ", None),
+        ("", None),
+        ("n/a", None),
+        ("1 234 5", None),
+        ("( 7 )", -7.0),
+    ],
+)
+def test_parse_number_handles_table_formats(load_run_fetch, raw, expected):
+    module = load_run_fetch({})
+
+    assert module._parse_number(raw) == expected
+
+
+def test_btc_etf_flow_prefers_higher_priority_provider(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    Status = module.FetchStatus
+
+    monkeypatch.setattr(
+        module,
+        "_fetch_sosovalue_latest_flow",
+        lambda key: (None, Status(name="s", ok=False, message="SoSoValue 超时")),
+    )
+    monkeypatch.setattr(
+        module,
+        "_fetch_coinglass_latest_flow",
+        lambda key: (12.0, Status(name="c", ok=True, message="CoinGlass OK")),
+    )
+    monkeypatch.setattr(
+        module,
+        "_fetch_farside_latest_flow",
+        lambda: (99.0, Status(name="f", ok=True, message="Farside OK")),
+    )
+
+    amount, status = module._fetch_btc_etf_flow(
+        {"sosovalue": "SOSO", "coinglass": "CG"}
+    )
+
+    assert amount == 12.0
+    assert status.ok
+    assert status.message == "CoinGlass OK；此前失败: SoSoValue 超时"
+
+
+def test_request_json_memoises_gets_inside_session_scope(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    calls = []
+
+    class _Response:
+        status_code = 200
+        content = b'{"ok": true}'
+
+        def raise_for_status(self) -> None:
+            return None
+
+    class _Session:
+        def request(self, method, url, **kwargs):
+            calls.append((method, url))
+            return _Response()
+
+        def close(self) -> None:
+            return None
+
+    monkeypatch.setattr(module, "_SESSION", _Session())
+    with module.http_session_scope():
+        first = module._request_json("https://example.com/q", params={"s": "hsi"})
+        first.pop("ok")
+        second = module._request_json("https://example.com/q", params={"s": "hsi"})
+        second["extra"] = 1
+        # Each hit decodes its own payload, so mutations never leak across callers.
+        assert module._request_json("https://example.com/q", params={"s": "hsi"}) == {
+            "ok": True
+        }
+        module._request_json("https://example.com/q", params={"s": "spy"})
+        module._request_json("https://example.com/q", method="POST", json_body={})
+
+    assert calls == [
+        ("GET", "https://example.com/q"),
+        ("GET", "https://example.com/q"),
+        ("POST", "https://example.com/q"),
+    ]
+    assert module._GET_CACHE is None
+
+
+def test_extract_latest_change_picks_two_newest_rows(load_run_fetch):
+    module = load_run_fetch({})
+    rows = [
+        {"date": "2024-04-03", "close": "110"},
+        {"date": "2024-03-28", "close": "90"},
+        {"date": "2024-04-02", "close": "100"},
+        {"date": "2024-04-01", "close": "95"},
+    ]
+
+    day, close, change_pct = module._extract_latest_change(rows)
+
+    assert (day, close) == ("2024-04-03", 110.0)
+    assert change_pct == pytest.approx(10.0)
+    # Duplicate dates resolve to the later row, as a stable ascending sort would.
+    rows.append({"date": "2024-04-03", "close": "120"})
+    assert module._extract_latest_change(rows)[1] == 120.0
+
+
+def test_fetch_stooq_series_indexes_header_once(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    csv_text = (
+        "Date, Open ,High,Low,Close,Volume\n"
+        "2024-04-01,1,2,0.5, 95 ,10\n"
+        ",1,2,0.5,96,10\n"
+        "2024-04-02,1,2,0.5,100,12\n"
+    )
+
+    def fake_get(url, **kwargs):
+        return SimpleNamespace(text=csv_text, raise_for_status=lambda: None)
+
+    monkeypatch.setattr(module, "_SESSION", SimpleNamespace(get=fake_get))
+
+    rows = module._fetch_stooq_series("^hsi")
+
+    assert [row["date"] for row in rows] == ["2024-04-01", "2024-04-02"]
+    assert rows[0]["close"] == "95" and rows[0]["open"] == "1"
+    assert module._extract_latest_change(rows)[1] == 100.0
+
+    csv_text = "No data\n"
+    with pytest.raises(RuntimeError, match="Stooq"):
+        module._fetch_stooq_series("^hsi")
+
+
+def test_coinglass_flow_falls_through_falsy_fields(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    payload = {
+        "code": "0",
+        "data": {
+            "list": [
+                {"date": "2024-04-02", "netFlow": 12.5},
+                {"date": "", "day": "2024-04-03", "netFlow": 0, "totalNetFlow": 99.0},
+            ]
+        },
+    }
+    monkeypatch.setattr(module, "_request_json", lambda *args, **kwargs: payload)
+
+    amount, status = module._fetch_coinglass_latest_flow("KEY")
+
+    assert amount == 99.0
+    assert "2024-04-03" in status.message
+    assert module._first_present({"netFlow": 0}, module.COINGLASS_AMOUNT_KEYS) is None
+    assert module._first_present({"totalNetFlow": 0}, module.COINGLASS_AMOUNT_KEYS) == 0
+
+
+def test_undated_feed_items_fall_back_to_utc_today(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+
+    class FrozenDateTime(module.datetime):
+        @classmethod
+        def now(cls, tz=None):  # type: ignore[override]
+            return module.datetime(2024, 4, 5, 23, 30, tzinfo=module.timezone.utc)
+
+    monkeypatch.setattr(module, "datetime", FrozenDateTime)
+    payload = "<rss><channel><item><title>A</title></item><item><title>B</title></item></channel></rss>"
+    monkeypatch.setattr(
+        module, "_SESSION", SimpleNamespace(get=lambda url, **kwargs: DummyResponse(payload))
+    )
+
+    events, _ = module._fetch_ai_rss_events(["https://example.com/rss"])
+
+    assert [event["date"] for event in events] == ["2024-04-05", "2024-04-05"]
+
+
+def _http_error(module, status, text=""):
+    response = module.requests.Response()
+    response.status_code = status
+    response._content = text.encode("utf-8")
+    return module.requests.HTTPError(f"{status}", response=response)
+
+
+def test_is_dead_key_error_only_flags_auth_and_quota(load_run_fetch):
+    module = load_run_fetch({})
+
+    assert module._is_dead_key_error(_http_error(module, 403))
+    daily_quota = (
+        '{"error": {"status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded", '
+        '"quotaId": "GenerateRequestsPerDayPerProjectPerModel-FreeTier"}}'
+    )
+    assert module._is_dead_key_error(_http_error(module, 429, daily_quota))
+    assert module._is_dead_key_error(_http_error(module, 400, "API_KEY_INVALID"))
+    wrapped = RuntimeError("HTTP 状态错误: 401")
+    wrapped.__cause__ = _http_error(module, 401)
+    assert module._is_dead_key_error(wrapped)
+
+    assert not module._is_dead_key_error(_http_error(module, 503))
+    assert not module._is_dead_key_error(_http_error(module, 429, "slow down"))
+    per_minute_quota = (
+        '{"error": {"status": "RESOURCE_EXHAUSTED", "message": "Quota exceeded for '
+        'metric generate_content_requests per minute", '
+        '"quotaId": "GenerateRequestsPerMinutePerProjectPerModel"}}'
+    )
+    assert not module._is_dead_key_error(_http_error(module, 429, per_minute_quota))
+    assert not module._is_dead_key_error(RuntimeError("HTTP 请求失败：超过重试预算"))
+
+
+def test_transient_ai_error_keeps_single_key_alive(monkeypatch, load_run_fetch):
+    config = {
+        "ai_news": {
+            "provider": "glm",
+            "model": "glm-test",
+            "keys": ["ONLY_TOKEN"],
+        }
+    }
+    module = load_run_fetch(config)
+    module.THROTTLE_DISABLED = True
+    calls = []
+
+    def fake_call(model, api_key, prompt, enable_network, timeout, thinking):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise _http_error(module, 503)
+        return {"choices": [{"message": {"content": "<news>- OK</news>"}}]}
+
+    monkeypatch.setattr(module, "_call_glm_chat_completions", fake_call)
+
+    now = datetime(2024, 4, 3, 12, 0, tzinfo=timezone.utc)
+    updates, statuses = module._fetch_ai_market_news(now, config, logger=None)
+
+    assert len(calls) == len(module.AI_NEWS_MARKET_SPECS)
+    assert len(updates) == len(module.AI_NEWS_MARKET_SPECS) - 1
+    assert not any("已耗尽" in status.message for status in statuses)
+
+
+def test_failed_gemini_batch_still_runs_per_market_fallback(monkeypatch, load_run_fetch):
+    config = {
+        "ai_news": {
+            "provider": "gemini",
+            "model": "gemini-test",
+            "keys": ["ONLY_TOKEN"],
+            "enable_network": False,
+        }
+    }
+    module = load_run_fetch(config)
+    module.THROTTLE_DISABLED = True
+    prompts = []
+
+    def fake_call(model, api_key, prompt, enable_network, timeout):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            raise _http_error(module, 403)
+        return {"candidates": [{"content": {"parts": [{"text": "<news>- OK</news>"}]}}]}
+
+    monkeypatch.setattr(module, "_call_gemini_generate_content", fake_call)
+
+    now = datetime(2024, 4, 3, 12, 0, tzinfo=timezone.utc)
+    updates, statuses = module._fetch_ai_market_news(now, config, logger=None)
+
+    assert len(prompts) == 1 + len(module.AI_NEWS_MARKET_SPECS)
+    assert len(updates) == len(module.AI_NEWS_MARKET_SPECS)
+    assert all(status.ok for status in statuses)
+
+
+def test_btc_etf_flow_skips_fallbacks_after_first_success(monkeypatch, load_run_fetch):
+    module = load_run_fetch({})
+    Status = module.FetchStatus
+
+    def unexpected(*_args):
+        raise AssertionError("lower-priority provider should not be queried")
+
+    monkeypatch.setattr(
+        module,
+        "_fetch_sosovalue_latest_flow",
+        lambda key: (7.0, Status(name="s", ok=True, message="SoSoValue OK")),
+    )
+    monkeypatch.setattr(module, "_fetch_coinglass_latest_flow", unexpected)
+    monkeypatch.setattr(module, "_fetch_farside_latest_flow", unexpected)
+
+    amount, status = module._fetch_btc_etf_flow({"sosovalue": "SOSO", "coinglass": "CG"})
+
+    assert amount == 7.0
+    assert status.message == "SoSoValue OK"
+
+
+def test_rss_item_event_matches_namespaced_children(load_run_fetch):
+    module = load_run_fetch({})
+    payload = b"""
+        <rss xmlns:dc="http://purl.org/dc/elements/1.1/"
+             xmlns:atom="http://www.w3.org/2005/Atom"><channel>
+            <item>
+                <atom:title>Namespaced Title</atom:title>
+                <dc:date>2024-04-02T09:00:00Z</dc:date>
+                <atom:link href="https://example.com/a"/>
+            </item>
+        </channel></rss>
+    """
+
+    # Nodes are cleared once iteration moves on, so consume the first in place.
+    node = next(module._iter_feed_nodes(payload))
+    event = module._rss_item_event(node, "https://example.com/rss", "2000-01-01")
+
+    assert event["title"] == "Namespaced Title"
+    assert event["date"] == "2024-04-02"
+    assert event["url"] == "https://example.com/a"
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from daily_messenger.common import jsonio
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_round_trip_keeps_utf8_and_indent(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    payload = {"title": "内参 · 盘前", "items": [1, 2.5, None], "nested": {"ok": True}}
+    encoded = jsonio.dumps_pretty(payload)
+
+    assert isinstance(encoded, bytes)
+    assert encoded.decode("utf-8") == json.dumps(payload, ensure_ascii=False, indent=2)
+    assert jsonio.loads(encoded) == payload
+
+
+def test_loads_accepts_stdlib_nan_literals() -> None:
+    assert jsonio.loads(b'{"value": NaN}')["value"] != jsonio.loads(b'{"value": NaN}')["value"]
+    with pytest.raises(ValueError):
+        jsonio.loads(b"{not json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_load_file_handles_regular_and_edge_inputs(
+    tmp_path, monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    path = tmp_path / "raw_market.json"
+    path.write_text(json.dumps({"market": {"名称": [1, 2]}}, ensure_ascii=False), encoding="utf-8")
+    assert jsonio.load_file(path) == {"market": {"名称": [1, 2]}}
+
+    path.write_bytes(b'{"value": NaN}')
+    assert jsonio.load_file(path)["value"] != jsonio.load_file(path)["value"]
+
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        jsonio.load_file(path)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_is_compact_utf8(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    assert jsonio.dumps({"名称": [1, None]}) == '{"名称":[1,null]}'.encode("utf-8")
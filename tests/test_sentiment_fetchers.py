@@ -7,6 +7,7 @@ from daily_messenger.scoring.adaptors import sentiment as sentiment_adaptor
 class _DummyResponse:
     def __init__(self, text: str, status_code: int = 200) -> None:
         self.text = text
+        self.content = text.encode("utf-8")
         self.status_code = status_code
 
     def raise_for_status(self) -> None:  # noqa: D401 - test helper
@@ -42,7 +43,6 @@ class _DummySession:
 def test_cboe_fetch_parses_ratios(monkeypatch: pytest.MonkeyPatch) -> None:
     base = "DATE,CALL,PUT,TOTAL,P/C Ratio\n10/10/2024,100,80,180,0.77\n"
     responses = {
-        "https://www.cboe.com": _DummyResponse("ok"),
         "https://cdn.cboe.com/resources/options/volume_and_call_put_ratios/equitypc.csv": _DummyResponse(
             base
         ),
@@ -137,3 +137,59 @@ def test_sentiment_adaptor_combines_sources() -> None:
 def test_sentiment_adaptor_handles_missing() -> None:
     result = sentiment_adaptor.aggregate({}, {})
     assert result is None
+
+
+def test_cboe_latest_csv_row_reads_last_data_row() -> None:
+    content = (
+        "Cboe equity put/call\n"
+        "DATE,CALL,PUT,TOTAL,P/C Ratio\n"
+        "10/9/2024,100,70,170,0.70\n"
+        "10/10/2024,100,80,180,0.80\n"
+        "10/11/2024,100,90,190,\n"
+        "\n"
+    )
+
+    assert cboe_putcall._latest_csv_row(content) == ("2024-10-10", 0.8)
+    with pytest.raises(RuntimeError):
+        cboe_putcall._latest_csv_row("DATE,P/C Ratio\n10/11/2024,\n")
+
+
+@pytest.mark.parametrize("text", ["13/01/2024", "1/2/24", "2024-01-02", "1/2"])
+def test_cboe_parse_csv_date_rejects_malformed(text: str) -> None:
+    with pytest.raises(ValueError):
+        cboe_putcall._parse_csv_date(text)
+
+
+def test_cboe_parse_csv_date_accepts_unpadded() -> None:
+    assert cboe_putcall._parse_csv_date("1/2/2024").isoformat() == "2024-01-02"
+    assert cboe_putcall._parse_csv_date("10/10/2024").isoformat() == "2024-10-10"
+
+
+def test_aaii_resolve_latest_story_stops_at_first_match() -> None:
+    # Trailing garbage after the matching item must not matter.
+    rss = (
+        "<?xml version='1.0'?><rss><channel>"
+        "<item><title>Weekly recap</title><link>https://example.com/recap</link></item>"
+        "<item><title>AAII Sentiment Survey</title><link>https://example.com/s</link></item>"
+        "<item><title>broken"
+    )
+    session = _DummySession({aaii_sentiment.RSS_URL: _DummyResponse(rss)})
+
+    assert aaii_sentiment._resolve_latest_story(session) == "https://example.com/s"
+    session = _DummySession({aaii_sentiment.RSS_URL: _DummyResponse("<rss><channel>")})
+    assert aaii_sentiment._resolve_latest_story(session) is None
+
+
+def test_aaii_parse_article_reads_labels_in_order() -> None:
+    html = "<p>bullish 40%</p><p>Bullish again</p><p>NEUTRAL: 30.5%</p><p>Bearish 29.5%</p>"
+
+    metrics = aaii_sentiment._parse_article(html)
+
+    assert metrics == {
+        "bullish_pct": 40.0,
+        "neutral_pct": 30.5,
+        "bearish_pct": 29.5,
+        "bull_bear_spread": 10.5,
+    }
+    assert aaii_sentiment._parse_article("Bearish 20% Bullish 40% Neutral 40%") is None
+    assert aaii_sentiment._parse_article("Bullish " + "x" * 50_000) is None